@@ -1,59 +1,104 @@
-import sys, os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import sys
 from abc import ABC, abstractmethod
+from importlib import import_module
+from types import MappingProxyType
 from typing import Type, Dict, Any
-from strategies.base import ITask
-from strategies.Http_get import HttpGetTask
-from strategies.notify_mock import NotifyMockTask
-from strategies.save_db import SaveDBTask
-from strategies.transform_simply import TransformSimpleTask
-from strategies.validate_csv import ValidateCSVTask
+from strategies.base import ITask, TASK_REGISTRY
 
 """Factory method doble funcion, es llamado para registrar todos las tareas a utilizar en los workflows
 Tambien es llamado para obtner la instancia de la tarea que se va a utilizar
 La clase Product es ITask
-Las clases concrete productos son las subclases de ITask: 
+Las clases concrete productos son las subclases de ITask:
 HttpGetTask, NotifyMockTask, SaveDBTask,TransformSimpleTask, ValidateCSVTask
 """
+
+# Mapa de carga perezosa: tipo de tarea -> módulo que la define. Importar el
+# módulo dispara @register_task, que puebla TASK_REGISTRY; así las
+# dependencias pesadas de cada estrategia (requests, pandas, win10toast)
+# solo se pagan la primera vez que ese tipo de tarea se usa, no al importar
+# este módulo.
+_TASK_MODULES: "MappingProxyType[str, str]" = MappingProxyType({
+    "http_get": "strategies.Http_get",
+    "validate_csv": "strategies.validate_csv",
+    "transform_simple": "strategies.transform_simply",
+    "save_db": "strategies.save_db",
+    "notify_mock": "strategies.notify_mock",
+})
+
+# Nombres de clase exportados por este módulo vía __getattr__ (PEP 562).
+_LAZY_CLASSES: Dict[str, str] = {
+    "HttpGetTask": "http_get",
+    "NotifyMockTask": "notify_mock",
+    "SaveDBTask": "save_db",
+    "TransformSimpleTask": "transform_simple",
+    "ValidateCSVTask": "validate_csv",
+}
+
+
+def _resolve(task_type: str) -> Type[ITask]:
+    """Devuelve la clase del tipo pedido, importando su módulo si hace falta."""
+    cls = TASK_REGISTRY.get(task_type)
+    if cls is None:
+        module = _TASK_MODULES.get(task_type)
+        if module is None:
+            raise ValueError(f"Tipo de tarea desconocido: {task_type}")
+        import_module(module)
+        cls = TASK_REGISTRY[task_type]
+    return cls
+
+
+def __getattr__(name: str):
+    """PEP 562: materializa y cachea la clase de estrategia al primer acceso."""
+    task_type = _LAZY_CLASSES.get(name)
+    if task_type is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = _resolve(task_type)
+    globals()[name] = cls
+    return cls
+
+
 class TaskFactory(ABC):
-   
+
     @abstractmethod
     def create():
         pass
 
 
-
-class http_getFactory(TaskFactory):
-    def create(self)-> ITask:
-        return HttpGetTask()
-    
-class notify_mockFactory(TaskFactory):
-    def create(self)-> ITask:
-        return NotifyMockTask()
-    
-class save_dbFactory(TaskFactory):
-    def create(self)-> ITask:
-        return SaveDBTask()
-    
-class transform_simplyFactory(TaskFactory):
-    def create(self)-> ITask:
-        return TransformSimpleTask()
-    
-class validate_csvFactory(TaskFactory):
-   def create(self)-> ITask:
-        return ValidateCSVTask()
-
-# === Clase Directora (elige la fábrica según tipo) ===
+# === Clase Directora (resuelve el tipo directamente contra la tabla) ===
 class TaskFactoryDirector(TaskFactory):
-    All_posible_tasks = {"http_get":http_getFactory,
-                             "validate_csv": validate_csvFactory, 
-                             "save_db":save_dbFactory,
-                             "notify_mock":notify_mockFactory, 
-                             "transform_simple":transform_simplyFactory
-                             }
-    def create(self, task_type: str) -> ITask:
-        if task_type in self.All_posible_tasks:
-            return self.All_posible_tasks[task_type]().create()
-        else:
-            raise ValueError(f"Tipo de tarea desconocido: {task_type}") 
+    # Vista de los tipos conocidos sin forzar ningún import de estrategia.
+    All_posible_tasks = _TASK_MODULES
+
+    @staticmethod
+    def create(task_type: str) -> ITask:
+        """
+        Devuelve una instancia nueva de la tarea pedida.
+
+        No se memoiza la instancia (flyweight): ITask.run registra estado
+        por ejecución en _execution_state, de modo que reutilizar una
+        instancia filtraría completed/failed/error entre ejecuciones. La
+        resolución del tipo es un dict.get sobre TASK_REGISTRY, con import
+        perezoso del módulo de la estrategia la primera vez.
+        """
+        return _resolve(sys.intern(task_type))()
+
+    @staticmethod
+    def resolve_class(task_type: str) -> Type[ITask]:
+        """
+        Devuelve la CLASE de la tarea sin instanciarla.
+
+        Para registros/catálogos que solo necesitan la referencia de clase:
+        evita construir (y descartar) una instancia completa solo para
+        leerle __class__.
+        """
+        return _resolve(task_type)
 
+    @staticmethod
+    def create_many(task_types) -> "list[ITask]":
+        """
+        Versión por lotes de create: instancia todas las tareas pedidas en
+        una sola pasada, amortizando el coste por llamada cuando un
+        workflow materializa N nodos de golpe.
+        """
+        reg = TASK_REGISTRY
+        return [(reg.get(t) or _resolve(t))() for t in task_types]
@@ -2,8 +2,18 @@ from sqlmodel import SQLModel, Field
 
 class workflowTable(SQLModel, table=True):
     __tablename__ = "workflowtable"
+    # El índice compuesto (status, created_at) que acelera el claim NO se
+    # declara aquí: con extend_existing=True cada import del módulo bajo
+    # otro nombre (Models... / Worker.Models...) re-registraría el Index y
+    # create_all fallaría con "index already exists". Lo garantiza
+    # WorkerService._ensure_claim_index con CREATE INDEX IF NOT EXISTS.
     __table_args__ = {"extend_existing": True}
 
+    # Nota: no se configura extra="forbid" porque los modelos SQLModel con
+    # table=True no validan con Pydantic al construirse — la opción sería
+    # un no-op. El setattr de atributos no declarados ya lo rechaza
+    # SQLAlchemy por sí solo.
+
     id: str = Field(primary_key=True, index=True)
     name: str
     status: str
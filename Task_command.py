@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Any, Dict
 
@@ -13,6 +14,11 @@ class TaskCommand:
     params: Dict[str, Any] = field(default_factory=dict)  # Parámetros de ejecución
     metadata: Dict[str, Any] = field(default_factory=dict)  # Info opcional del flujo o UI
 
+    def __post_init__(self):
+        # Internar el tipo: el despacho en la tabla de tareas usa claves
+        # internadas y así el lookup compara por identidad de puntero.
+        self.type = sys.intern(self.type)
+
     def __repr__(self) -> str:
         return (
             f"<TaskCommand type={self.type} node={self.node_key} run={self.run_id}>"
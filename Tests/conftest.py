@@ -0,0 +1,44 @@
+"""
+Fixtures compartidas de toda la suite de tests.
+"""
+import time
+
+import pytest
+
+from Worker.decorador import RetryDecorator
+
+_real_retry_init = RetryDecorator.__init__
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(request, monkeypatch):
+    """
+    Neutraliza las esperas de reloj en todos los tests.
+
+    - time.sleep pasa a no-op: las pausas de polling y cualquier sleep de
+      tarea no queman tiempo de pared real.
+    - RetryDecorator se construye con delay 0, así sus backoffs
+      (Event.wait(0)) despiertan al instante y max_retries=3 corre en
+      microsegundos.
+
+    No se parchea threading.Event.wait de forma global: Thread.start()
+    espera internamente sobre un Event y un wait adulterado rompe la
+    sincronización real de hilos.
+
+    Los tests marcados con @pytest.mark.real_sleep quedan exentos: los
+    de integración acotan el worker por ventana de reloj real
+    (_run_worker_for) y sin sleeps reales stop() corre a destiempo
+    contra el hilo de polling.
+    """
+    if request.node.get_closest_marker("real_sleep"):
+        return
+
+    monkeypatch.setattr(time, "sleep", lambda *_args, **_kwargs: None)
+
+    def _fast_retry_init(self, wrapped_task, max_retries=3, delay_seconds=1.0,
+                         backoff_multiplier=2.0, stop_event=None):
+        _real_retry_init(self, wrapped_task, max_retries=max_retries,
+                         delay_seconds=0.0, backoff_multiplier=0.0,
+                         stop_event=stop_event)
+
+    monkeypatch.setattr(RetryDecorator, "__init__", _fast_retry_init)
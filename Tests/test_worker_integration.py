@@ -18,6 +18,11 @@ from Worker.Models.shared_workflow_table import workflowTable
 
 from Worker.service.worker_service import WorkerService
 
+# Estos tests acotan el worker por tiempo de pared (_run_worker_for), así
+# que necesitan sleeps reales: sin ellos stop() corre a destiempo contra
+# el hilo de polling.
+pytestmark = pytest.mark.real_sleep
+
 
 # ============================================================
 # CONFIGURACIÓN
@@ -3,10 +3,13 @@
 Tests para el WorkerService que lee workflows de la BD compartida.
 """
 import pytest
+import functools
 import json
+import os
 import time
 from datetime import datetime, UTC
 from pathlib import Path
+from sqlalchemy import text
 from sqlmodel import create_engine, SQLModel, Session, Field as SQLField, select
 from typing import Optional
 
@@ -18,8 +21,15 @@ from Worker.registry import Taskregistry
 # FUNCIÓN HELPER PARA MODELO
 # ============================================================
 
+@functools.lru_cache(maxsize=None)
 def get_workflow_table_model():
-    """Factory para crear el modelo cada vez que se necesite"""
+    """
+    Factory memoizada del modelo de la tabla compartida.
+
+    Definir la clase reconstruye la metadata de la tabla y dispara avisos
+    de mapper duplicado; con lru_cache todas las llamadas de la sesión de
+    tests comparten la misma clase.
+    """
     class workflowTable(SQLModel, table=True):
         """Modelo idéntico al que usa la API"""
         __tablename__ = "workflowtable"
@@ -39,29 +49,44 @@ def get_workflow_table_model():
 # FIXTURES
 # ============================================================
 
-@pytest.fixture
-def shared_db_path(tmp_path):
-    """Crea una BD compartida temporal para tests"""
-    db_path = tmp_path / "test_shared.db"
+@pytest.fixture(scope="session")
+def shared_engine():
+    """
+    Engine SQLite en memoria compartido por toda la sesión de tests.
 
-    # Limpiar metadata ANTES de crear tablas
-    from sqlmodel import SQLModel
-    SQLModel.metadata.clear()
-    
-    # Crear engine
+    La BD usa cache=shared con nombre propio y una conexión «ancla» que la
+    mantiene viva aunque algún test llame a stop() (que hace dispose() del
+    engine). El esquema se crea UNA vez en lugar de pagar create_all +
+    fsync de un fichero temporal por test.
+    """
+    import sqlite3
+    # Nombre de BD keyeado por worker de pytest-xdist: con `-n auto` cada
+    # proceso gw* tiene su propio handle en memoria y no hay contención;
+    # sin xdist el nombre cae en 'gw0' y todo funciona igual.
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    db_name = f"worker_tests_shared_{worker_id}"
+    anchor = sqlite3.connect(
+        f"file:{db_name}?mode=memory&cache=shared",
+        uri=True, check_same_thread=False,
+    )
     engine = create_engine(
-        f"sqlite:///{db_path}", 
-        connect_args={"check_same_thread": False}
+        f"sqlite:///file:{db_name}?mode=memory&cache=shared&uri=true",
+        connect_args={"check_same_thread": False},
     )
-    
-   # Crear tabla compartida en esta BD
+    # Limpiar metadata UNA vez: el import del servicio ya registró la tabla
+    # de Models y redefinirla duplicaría sus índices.
+    SQLModel.metadata.clear()
     workflowTable = get_workflow_table_model()
     workflowTable.__table__.create(engine, checkfirst=True)
-    
-    yield str(db_path)
-    
-    # Cleanup
+    yield engine
     engine.dispose()
+    anchor.close()
+
+
+@pytest.fixture
+def shared_db_path(tmp_path):
+    """Ruta de BD compartida temporal (solo para las tablas del repo)"""
+    return str(tmp_path / "test_shared.db")
 
 
 @pytest.fixture
@@ -83,21 +108,24 @@ def workflow_repo_for_tests(worker_db_path):
     return repo
 
 @pytest.fixture
-def worker_service(shared_db_path, worker_db_path):
+def worker_service(shared_db_path, worker_db_path, shared_engine):
     """Crea un WorkerService configurado para tests"""
-    from sqlmodel import SQLModel
-
     service = WorkerService(
         shared_db_path=shared_db_path,
         poll_interval=1.0,  # Intervalo corto para tests rápidos
         worker_db_path=worker_db_path
     )
-    
+
+    # Sustituir el engine propio del servicio por el engine en memoria de
+    # la sesión: el servicio opera siempre vía self.shared_engine.
+    own_engine = service.shared_engine
+    service.shared_engine = shared_engine
+
     # ✅ Verificar que las tablas del Worker se crearon
     from sqlalchemy import inspect
     inspector = inspect(service.repo.engine)
     tables = inspector.get_table_names()
-    
+
     if "workflowrun" not in tables or "noderun" not in tables:
         raise RuntimeError(
             f"❌ Tablas de Worker no creadas en {worker_db_path}.\n"
@@ -105,32 +133,27 @@ def worker_service(shared_db_path, worker_db_path):
             f"   Se esperaba: ['workflowrun', 'noderun']"
         )
     yield service
-    
-    # Cleanup
+
+    # Cleanup: devolver el engine propio antes de stop() para que dispose()
+    # no cierre la conexión (y con ella la BD) compartida de la sesión.
+    service.shared_engine = own_engine
     service.stop()
     service.registry.clear()
-    
-    # ✅ CRÍTICO: Cerrar los engines que creó el service
-    if hasattr(service, 'shared_engine') and service.shared_engine:
-        service.shared_engine.dispose()
-    if hasattr(service, 'repo') and hasattr(service.repo, 'engine'):
-        service.repo.engine.dispose()
-    SQLModel.metadata.clear()
+
+    # Aislamiento por test: vaciar la tabla compartida en vez de recrear BD
+    with shared_engine.begin() as conn:
+        conn.execute(text("DELETE FROM workflowtable"))
 
 @pytest.fixture
-def populated_db(shared_db_path):
+def populated_db(shared_engine):
     """Fixture que crea workflows de prueba en la BD compartida"""
-    engine = create_engine(
-        f"sqlite:///{shared_db_path}", 
-        connect_args={"check_same_thread": False}
-    )
-    
+
     def _create_workflow(workflow_id: str, name: str, status: str, definition: dict):
         """Helper para crear workflows"""
         # ✅ Obtener el modelo DENTRO de esta función
         workflowTable = get_workflow_table_model()
-        
-        with Session(engine) as session:
+
+        with Session(shared_engine) as session:
             workflow = workflowTable(
                 id=workflow_id,
                 name=name,
@@ -141,11 +164,37 @@ def populated_db(shared_db_path):
             )
             session.add(workflow)
             session.commit()
-    
-    yield _create_workflow
-    
-    # Cleanup
-    engine.dispose()
+
+    return _create_workflow
+
+
+@pytest.fixture
+def populated_db_many(shared_engine):
+    """Inserta una lista de workflows en una sola transacción (executemany)"""
+    from sqlalchemy import insert
+
+    def _create_workflows(rows):
+        workflowTable = get_workflow_table_model()
+        now = datetime.now(UTC).isoformat()
+
+        with Session(shared_engine) as session:
+            session.execute(
+                insert(workflowTable),
+                [
+                    {
+                        "id": row["id"],
+                        "name": row["name"],
+                        "status": row["status"],
+                        "created_at": now,
+                        "updated_at": now,
+                        "definition": json.dumps(row["definition"]),
+                    }
+                    for row in rows
+                ],
+            )
+            session.commit()
+
+    return _create_workflows
 
 
 # ============================================================
@@ -172,9 +221,11 @@ def test_get_pending_workflows_with_data(worker_service, populated_db):
     
     assert len(pending) == 2
     assert all(wf["status"] == "en_espera" for wf in pending)
-    assert "wf1" in [wf["id"] for wf in pending]
-    assert "wf2" in [wf["id"] for wf in pending]
-    assert "wf3" not in [wf["id"] for wf in pending]
+    # Un único set para los chequeos de pertenencia (en vez de una list
+    # comprehension por assert).
+    ids = {wf["id"] for wf in pending}
+    assert {"wf1", "wf2"} <= ids
+    assert "wf3" not in ids
 
 
 def test_get_pending_workflows_structure(worker_service, populated_db):
@@ -255,8 +306,6 @@ def test_update_workflow_status_with_results(worker_service, populated_db, share
         assert "execution_results" in saved_def
         assert saved_def["execution_results"] == results
         assert "executed_at" in saved_def
-    
-    worker_service.shared_engine.dispose()
 
 
 def test_update_workflow_status_nonexistent(worker_service):
@@ -315,25 +364,18 @@ def test_convert_api_workflow_empty_steps(worker_service):
     assert worker_def.nodes == []
 
 
-def test_map_step_type_all_types(worker_service):
-    """Valida mapeo de todos los tipos de tareas"""
-    mappings = {
-        "HTTPS GET Request": "http_get",
-        "Validate CSV File": "validate_csv",
-        "Simple Transform": "transform_simple",
-        "Save to Database": "save_db",
-        "Mock Notification": "notify_mock"
-    }
-    
-    for api_type, expected_worker_type in mappings.items():
-        result = worker_service._map_step_type(api_type)
-        assert result == expected_worker_type, f"Mapeo incorrecto para {api_type}"
-
-
-def test_map_step_type_unknown(worker_service):
-    """Valida manejo de tipo desconocido"""
-    result = worker_service._map_step_type("Unknown Task Type")
-    assert result == "unknown_task_type"  # Debe convertir a snake_case
+@pytest.mark.parametrize("api_type,expected_worker_type", [
+    ("HTTPS GET Request", "http_get"),
+    ("Validate CSV File", "validate_csv"),
+    ("Simple Transform", "transform_simple"),
+    ("Save to Database", "save_db"),
+    ("Mock Notification", "notify_mock"),
+    ("Unknown Task Type", "unknown_task_type"),  # fallback a snake_case
+])
+def test_map_step_type(worker_service, api_type, expected_worker_type):
+    """Valida mapeo de tipos de tareas (incluido el tipo desconocido)"""
+    result = worker_service._map_step_type(api_type)
+    assert result == expected_worker_type, f"Mapeo incorrecto para {api_type}"
 
 
 def test_map_worker_status_to_api(worker_service):
@@ -354,16 +396,10 @@ def test_map_worker_status_to_api(worker_service):
 # TESTS DE EJECUCIÓN DE WORKFLOWS
 # ============================================================
 
-def test_execute_workflow_success(worker_service, populated_db, mocker):
+def test_execute_workflow_success(worker_service, populated_db, fake_http):
     """Valida ejecución exitosa de un workflow simple"""
-    # Mock de requests para http_get
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.text = "test data"
-    mock_response.headers = {"Content-Type": "text/plain"}
-    mock_response.raise_for_status = mocker.Mock()
-    mocker.patch('requests.get', return_value=mock_response)
-    
+    fake_http.text = "test data"
+
     # Crear workflow de prueba
     definition = {
         "steps": [
@@ -403,16 +439,11 @@ def test_execute_workflow_success(worker_service, populated_db, mocker):
     assert worker_service.stats["failed"] == 0
 
 
-def test_execute_workflow_marks_in_progress(worker_service, populated_db, shared_db_path, mocker):
+def test_execute_workflow_marks_in_progress(worker_service, populated_db, shared_db_path, fake_http):
     """Valida que el workflow se marque como 'en_progreso' al iniciar"""
-    # Mock para evitar ejecución real
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.text = "data"
-    mock_response.headers = {}
-    mock_response.raise_for_status = mocker.Mock()
-    mocker.patch('requests.get', return_value=mock_response)
-    
+    # El stub evita la ejecución HTTP real
+    fake_http.headers = {}
+
     definition = {
         "steps": [
             {"type": "HTTPS GET Request", "args": {"url": "http://test.com"}},
@@ -435,8 +466,6 @@ def test_execute_workflow_marks_in_progress(worker_service, populated_db, shared
         
         # Debe estar completado (o fallido si algo falló)
         assert workflow.status in ["completado", "fallido", "en_progreso"]
-    
-    worker_service.shared_engine.dispose()
 
 
 def test_execute_workflow_with_error(worker_service, populated_db, mocker):
@@ -444,7 +473,7 @@ def test_execute_workflow_with_error(worker_service, populated_db, mocker):
     # Crear workflow que fallará (URL inválida)
     # ✅ Mockear requests para que lance excepción
     import requests
-    mocker.patch('requests.get', side_effect=requests.exceptions.ConnectionError("Connection failed"))
+    mocker.patch('strategies.Http_get._http.get', side_effect=requests.exceptions.ConnectionError("Connection failed"))
     
     definition = {
         "steps": [
@@ -493,10 +522,10 @@ def test_worker_service_start_stop(worker_service):
     
     # Detener
     worker_service.stop()
-    
-    # Esperar un momento
-    time.sleep(0.5)
-    
+
+    # Esperar la señal de salida del loop (despierta en <1 ms, sin sleep fijo)
+    assert worker_service._stopped.wait(timeout=1.0)
+
     # Verificar que se detuvo
     assert worker_service._stop_flag is True
 
@@ -512,16 +541,9 @@ def test_worker_service_get_stats(worker_service):
     assert stats["total_processed"] == 0
 
 
-def test_worker_service_processes_multiple_workflows(worker_service, populated_db, mocker):
+def test_worker_service_processes_multiple_workflows(worker_service, populated_db_many, fake_http):
     """Valida que el servicio procese múltiples workflows en un ciclo"""
-    # Mock de requests
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.text = "data"
-    mock_response.headers = {"Content-Type": "text/plain"} 
-    mock_response.raise_for_status = mocker.Mock()
-    mocker.patch('requests.get', return_value=mock_response)
-    
+
     # Crear 3 workflows pendientes
     definition = {
         "steps": [
@@ -530,8 +552,10 @@ def test_worker_service_processes_multiple_workflows(worker_service, populated_d
         ]
     }
     
-    for i in range(3):
-        populated_db(f"wf{i}", f"workflow_{i}", "en_espera", definition)
+    populated_db_many([
+        {"id": f"wf{i}", "name": f"workflow_{i}", "status": "en_espera", "definition": definition}
+        for i in range(3)
+    ])
     
     # Ejecutar un ciclo de polling manualmente
     pending = worker_service._get_pending_workflows_from_db()
@@ -544,7 +568,7 @@ def test_worker_service_processes_multiple_workflows(worker_service, populated_d
             successful += 1  # ← Solo contar si tuvo éxito
     
     # Validar estadísticas
-    print(f"Estos son los procesados :{worker_service.stats["total_processed"]}")
+    print(f"Estos son los procesados :{worker_service.stats['total_processed']}")
     assert worker_service.stats["total_processed"] == 3
 
 
@@ -552,7 +576,7 @@ def test_worker_service_processes_multiple_workflows(worker_service, populated_d
 # TESTS DE INTEGRACIÓN
 # ============================================================
 
-def test_end_to_end_workflow_execution(worker_service, populated_db, shared_db_path, mocker):
+def test_end_to_end_workflow_execution(worker_service, populated_db, shared_db_path, fake_http):
     """
     Test end-to-end completo:
     1. Se crea workflow en BD
@@ -560,14 +584,9 @@ def test_end_to_end_workflow_execution(worker_service, populated_db, shared_db_p
     3. Worker lo ejecuta
     4. Worker actualiza estado
     """
-    # Mock de requests
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.text = '{"result": "success"}'
-    mock_response.headers = {"Content-Type": "application/json"}
-    mock_response.raise_for_status = mocker.Mock()
-    mocker.patch('requests.get', return_value=mock_response)
-    
+    fake_http.text = '{"result": "success"}'
+    fake_http.headers = {"Content-Type": "application/json"}
+
     # 1. Crear workflow en BD (como lo haría la API)
     definition = {
         "steps": [
@@ -606,8 +625,6 @@ def test_end_to_end_workflow_execution(worker_service, populated_db, shared_db_p
         assert "execution_results" in saved_def
         assert "step_0" in saved_def["execution_results"]
         assert "step_1" in saved_def["execution_results"]
-    
-    worker_service.shared_engine.dispose()
 
 
 # ============================================================
@@ -615,12 +632,20 @@ def test_end_to_end_workflow_execution(worker_service, populated_db, shared_db_p
 # ============================================================
 
 @pytest.fixture
-def mock_requests(request, mocker):
-    """Fixture para mockear requests automáticamente"""
-    if request.param:
-        mock_response = mocker.Mock()
-        mock_response.status_code = 200
-        mock_response.text = "mocked response"
-        mock_response.headers = {}
-        mock_response.raise_for_status = mocker.Mock()
-        mocker.patch('requests.get', return_value=mock_response)
+def fake_http(mocker):
+    """
+    Stub compartido de la sesión HTTP del módulo Http_get.
+
+    Construye UNA respuesta 200 genérica y parchea _http.get; los tests
+    que necesiten valores concretos mutan los atributos del stub
+    (fake_http.text = ...) en vez de rearmar el mismo Mock cada vez.
+    """
+    resp = mocker.Mock(status_code=200, text="data", encoding="utf-8",
+                       headers={"Content-Type": "text/plain"})
+    resp.raise_for_status = mocker.Mock()
+    # iter_content lee resp.text al momento de la llamada, así los tests
+    # pueden mutar .text después de crear el stub.
+    resp.iter_content = lambda size: iter([resp.text.encode()])
+    resp.close = mocker.Mock()
+    mocker.patch('strategies.Http_get._http.get', return_value=resp)
+    return resp
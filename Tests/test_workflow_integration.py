@@ -7,25 +7,30 @@ from Worker.workflow.workflow_persistence import WorkflowRepository
 from Worker.workflow.workflow_models import WorkflowDefinition, WorkflowNode
 from Worker.workflow.workflow_engine import WorkflowEngine
 from Worker.worker_engine import WorkerEngine
-
+from Worker.registry import Taskregistry
 
 # ============================================================
 # FIXTURES
 # ============================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def task_registry():
-    """Fixture que proporciona un TaskRegistry limpio con tareas mock."""
-    from Worker.registry import Taskregistry
+    """Registro compartido del módulo, construido perezosamente.
+
+    Se materializa en el primer test (no en la colección) para que los
+    register_many resuelvan las clases de estrategia DESPUÉS de que los
+    mocks/imports de la sesión hayan tenido efecto. Las estrategias son
+    clases sin estado compartido, así que un solo catálogo sirve para
+    todos los tests del módulo sin repetir los cinco register por test.
+    """
     registry = Taskregistry()
-    
-    # Registrar tareas reales del sistema
-    registry.register("http_get")
-    registry.register("validate_csv")
-    registry.register("transform_simple")
-    registry.register("save_db")
-    registry.register("notify_mock")
-    
+    registry.register_many([
+        "http_get",
+        "validate_csv",
+        "transform_simple",
+        "save_db",
+        "notify_mock",
+    ])
     yield registry
     registry.clear()
 
@@ -33,21 +38,18 @@ def task_registry():
 @pytest.fixture
 def workflow_repo(tmp_path):
     """Fixture que proporciona un WorkflowRepository temporal."""
-    db_path = tmp_path / "test_workflows.db"
-    # ✅ WorkflowRepository ahora crea las tablas automáticamente
-    repo = WorkflowRepository(str(db_path))
-    
-    
-    # Verificar que las tablas existen
-    from sqlalchemy import inspect
-    inspector = inspect(repo.engine)
-    tables = inspector.get_table_names()
-    
+    # WorkflowRepository crea (y verifica) las tablas en __init__; la
+    # comprobación con inspector vive en test_repo_schema, una sola vez.
+    return WorkflowRepository(str(tmp_path / "test_workflows.db"))
 
+
+def test_repo_schema(tmp_path):
+    """Smoke test único del esquema que crea WorkflowRepository."""
+    from sqlalchemy import inspect
+    repo = WorkflowRepository(str(tmp_path / "schema.db"))
+    tables = inspect(repo.engine).get_table_names()
     assert "workflowrun" in tables, f"Tabla workflowrun no existe. Tablas: {tables}"
     assert "noderun" in tables, f"Tabla noderun no existe. Tablas: {tables}"
-    
-    yield repo
 
 
 @pytest.fixture
@@ -66,7 +68,7 @@ def workflow_engine(worker_engine, workflow_repo):
 # TESTS DE INTEGRACIÓN CON MOCKS
 # ============================================================
 
-@patch('requests.get')
+@patch('strategies.Http_get._http.get')
 def test_run_simple_workflow(mock_get, workflow_engine, workflow_repo):
     """
     Prueba la ejecución end-to-end de un workflow básico.
@@ -75,8 +77,11 @@ def test_run_simple_workflow(mock_get, workflow_engine, workflow_repo):
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.text = '{"data": "test"}'
+    mock_response.encoding = "utf-8"
     mock_response.headers = {"Content-Type": "application/json"}
     mock_response.raise_for_status = Mock()
+    mock_response.json = Mock(return_value={"data": "test"})
+    mock_response.iter_content = lambda size: iter([mock_response.text.encode()])
     mock_get.return_value = mock_response
     
     # 1️⃣ Crear un workflow de prueba usando WorkflowDefinition de models
@@ -123,7 +128,7 @@ def test_run_workflow_with_error(mock_exists, workflow_engine, workflow_repo):
     assert "v1" in result.results
 
 
-@patch('requests.get')
+@patch('strategies.Http_get._http.get')
 def test_workflow_with_branching(mock_get, workflow_engine, workflow_repo):
     """
     Prueba un workflow con múltiples ramas (branching).
@@ -139,8 +144,11 @@ def test_workflow_with_branching(mock_get, workflow_engine, workflow_repo):
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.text = 'col1,col2\nval1,val2'
+    mock_response.encoding = "utf-8"
     mock_response.headers = {}
     mock_response.raise_for_status = Mock()
+    mock_response.iter_content = lambda size: iter([mock_response.text.encode()])
+    mock_response.close = Mock()
     mock_get.return_value = mock_response
     
     # Mock para validate_csv (simular que el archivo existe)
@@ -170,7 +178,7 @@ def test_workflow_with_branching(mock_get, workflow_engine, workflow_repo):
             assert node_id in result.results
 
 
-@patch('requests.get')
+@patch('strategies.Http_get._http.get')
 def test_workflow_with_dependencies(mock_get, workflow_engine):
     """
     Valida que las dependencias se respeten en el orden de ejecución.
@@ -179,8 +187,11 @@ def test_workflow_with_dependencies(mock_get, workflow_engine):
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.text = 'data'
+    mock_response.encoding = "utf-8"
     mock_response.headers = {}
     mock_response.raise_for_status = Mock()
+    mock_response.iter_content = lambda size: iter([mock_response.text.encode()])
+    mock_response.close = Mock()
     mock_get.return_value = mock_response
     
     with patch('os.path.exists', return_value=True), \
@@ -224,7 +235,7 @@ def test_workflow_skips_on_failed_dependency(mock_exists, workflow_engine):
     assert result.results["dependent"]["status"] == "SKIPPED"
 
 
-@patch('requests.get')
+@patch('strategies.Http_get._http.get')
 def test_workflow_from_dict(mock_get, workflow_engine):
     """
     Valida la creación de workflow desde diccionario.
@@ -233,8 +244,11 @@ def test_workflow_from_dict(mock_get, workflow_engine):
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.text = 'success'
+    mock_response.encoding = "utf-8"
     mock_response.headers = {}
     mock_response.raise_for_status = Mock()
+    mock_response.iter_content = lambda size: iter([mock_response.text.encode()])
+    mock_response.close = Mock()
     mock_get.return_value = mock_response
     
     workflow_dict = {
@@ -0,0 +1,10 @@
+# Worker/__init__.py
+# Ruta del proyecto calculada una sola vez al cargar el paquete, con guarda
+# para no mutar sys.path (ni invalidar las cachés de importlib) en imports
+# repetidos de los módulos del Worker.
+import os
+import sys
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
@@ -1,12 +1,31 @@
 
 from typing import Dict, Any, Optional
 import json
+import re
+import threading
 import time
 import logging
-from datetime import datetime, UTC
-from functools import wraps
-from abc import ABC
-from strategies.base import ITask #Class component, 
+from strategies.base import ITask #Class component,
+
+# Serialización para logs: orjson (C) con indentado si está disponible,
+# fallback a UN JSONEncoder compartido de la stdlib (json.dumps construye un
+# encoder nuevo por llamada). default=str en ambos caminos: los payloads
+# pueden traer datetime/bytes (headers de http_get) y un log nunca debe
+# romper la tarea con TypeError.
+try:
+    import orjson as _orjson
+
+    def _dumps_pretty(obj: Any) -> str:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2, default=str).decode()
+except ImportError:
+    _dumps_pretty = json.JSONEncoder(
+        indent=2, ensure_ascii=False, default=str
+    ).encode
+
+# Claves sensibles como UNA regex precompilada: un solo escaneo en C por
+# clave, en vez de un substring-in + .lower() por cada patrón.
+_SENSITIVE_RE = re.compile(r"password|token|api[_-]?key|secret|auth", re.IGNORECASE)
+_is_sensitive = _SENSITIVE_RE.search
 
 class TaskDecorator(ITask):
     """
@@ -21,7 +40,10 @@ class TaskDecorator(ITask):
         """
         super().__init__()  # Inicializar logger y estado
         self._wrapped_task = wrapped_task
-        
+        # Cachear el método run ya ligado a la tarea envuelta: evita el lookup
+        # de atributo y la creación de un bound method en cada invocación.
+        self._wrapped_run = wrapped_task.run
+
         # Copiar metadata de la tarea envuelta
         self.type = wrapped_task.type
         self.display_name = wrapped_task.display_name
@@ -63,6 +85,29 @@ class TaskDecorator(ITask):
         return self._wrapped_task.on_error(error, context, params)
 
 
+class _Timer:
+    """
+    Context manager de medición compartido por los decoradores.
+    Mide con el reloj monotónico entero (inmune a ajustes NTP) y guarda la
+    duración como int de nanosegundos; la conversión a segundos (float) se
+    hace solo cuando alguien la pide.
+    """
+    __slots__ = ("_start_ns", "duration_ns")
+
+    def __enter__(self) -> "_Timer":
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.duration_ns = time.perf_counter_ns() - self._start_ns
+        return False
+
+    @property
+    def duration(self) -> float:
+        """Duración en segundos (derivada del entero de ns)."""
+        return self.duration_ns / 1e9
+
+
 class TimeDecorator(TaskDecorator):
     """
     Decorador de tiempo de ejecución.
@@ -70,28 +115,32 @@ class TimeDecorator(TaskDecorator):
     """
     def run(self, context: Dict[str, Any], params: Dict[str, Any]) -> Any:
         task_name = self._wrapped_task.__class__.__name__
-        start_time = time.time()
+        timer = _Timer()
+        log_info = self.logger.isEnabledFor(logging.INFO)
 
-        self.logger.info(f"⏱️  [{task_name}] Iniciando ejecución...")
+        if log_info:
+            self.logger.info("⏱️  [%s] Iniciando ejecución...", task_name)
 
         try:
-            # ✅ Ejecuta la tarea envuelta
-            result = self._wrapped_task.run(context, params)
-            duration = time.time() - start_time
-            # Añadir duración al resultado
-            if isinstance(result, dict):
-                result["_execution_time_seconds"] = round(duration, 3)
-            
-            self.logger.info(f"✅ [{task_name}] Completada en {duration:.3f}s")
-            
-            return result
-
-        except Exception as e:
+            # ✅ Ejecuta la tarea envuelta (el timer cierra la medición al salir)
+            with timer:
+                result = self._wrapped_run(context, params)
+        except Exception:
             # Registrar tiempo incluso si falla
-            duration = time.time() - start_time
-            self.logger.error(f"❌ [{task_name}] Falló después de {duration:.3f}s")
+            self.logger.error("❌ [%s] Falló después de %.3fs", task_name, timer.duration)
             raise
 
+        # Añadir duración al resultado: el int de ns es la medida exacta y
+        # barata; los segundos redondeados se mantienen por compatibilidad.
+        if isinstance(result, dict):
+            result["_execution_time_ns"] = timer.duration_ns
+            result["_execution_time_seconds"] = round(timer.duration, 3)
+
+        if log_info:
+            self.logger.info("✅ [%s] Completada en %.3fs", task_name, timer.duration)
+
+        return result
+
 class LoggingDecorator(TaskDecorator):
     """
     Decorador que imprime logs estructurados antes y después de la ejecución.
@@ -107,25 +156,28 @@ class LoggingDecorator(TaskDecorator):
          - ✅ Sanitiza información sensible
         """
         task_name = self._wrapped_task.__class__.__name__
-        
+        # Guardia de nivel: sanitizar + serializar solo si INFO está activo;
+        # con WARNING+ el decorador no paga ningún json.dumps.
+        log_info = self.logger.isEnabledFor(logging.INFO)
+
         # Log de parámetros (sanitizados)
-        sanitized_params = self._sanitize_params(params)
-        self.logger.info(
-            f"📋 [{task_name}] Parámetros:\n"
-            f"{json.dumps(sanitized_params, indent=2, ensure_ascii=False)}"
-        )
-        
+        if log_info:
+            self.logger.info(
+                f"📋 [{task_name}] Parámetros:\n"
+                f"{_dumps_pretty(self._sanitize_params(params))}"
+            )
+
         try:
             # Ejecutar tarea
-            result = self._wrapped_task.run(context, params)
-            
+            result = self._wrapped_run(context, params)
+
             # Log de resultado (truncado)
-            truncated_result = self._truncate_result(result)
-            self.logger.info(
-                f"📤 [{task_name}] Resultado:\n"
-                f"{json.dumps(truncated_result, indent=2, ensure_ascii=False)}"
-            )
-            
+            if log_info:
+                self.logger.info(
+                    f"📤 [{task_name}] Resultado:\n"
+                    f"{_dumps_pretty(self._truncate_result(result))}"
+                )
+
             return result
             
         except Exception as e:
@@ -138,30 +190,93 @@ class LoggingDecorator(TaskDecorator):
             raise
     
     def _sanitize_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Sanitiza información sensible"""
-        sanitized = params.copy()
-        
-        # Ocultar campos sensibles
-        sensitive_keys = ["password", "token", "api_key", "secret", "auth"]
-        for key in sanitized:
-            if any(sens in key.lower() for sens in sensitive_keys):
-                sanitized[key] = "***HIDDEN***"
-        
-        return sanitized
-    
+        """Sanitiza información sensible (sin copiar si no hay nada que ocultar)"""
+        if not any(_is_sensitive(key) for key in params):
+            return params
+        return {
+            key: "***HIDDEN***" if _is_sensitive(key) else value
+            for key, value in params.items()
+        }
+
     def _truncate_result(self, result: Any) -> Any:
-        """Trunca resultados largos para logging"""
+        """Trunca resultados largos para logging (sin copiar si nada excede)"""
         if isinstance(result, dict):
-            truncated = {}
-            for key, value in result.items():
-                if isinstance(value, str) and len(value) > self.truncate_length:
-                    truncated[key] = value[:self.truncate_length] + "..."
-                else:
-                    truncated[key] = value
-            return truncated
+            limit = self.truncate_length
+            if not any(isinstance(v, str) and len(v) > limit for v in result.values()):
+                return result
+            return {
+                key: value[:limit] + "..."
+                if isinstance(value, str) and len(value) > limit else value
+                for key, value in result.items()
+            }
         return result
 
 
+class FusedTimeLoggingDecorator(TaskDecorator):
+    """
+    Fusión de TimeDecorator + LoggingDecorator en un solo run().
+
+    La cadena anidada Logging(Time(base)) paga dos frames de Python y dos
+    despachos por nodo; para tareas de microsegundos ese envoltorio domina
+    el coste. Esta clase inline-a ambas responsabilidades (mismos logs, en
+    el mismo orden, misma anotación de duración) en un único frame. La
+    selecciona WorkerEngine cuando la cadena configurada es exactamente
+    [TimeDecorator, LoggingDecorator].
+    """
+
+    def __init__(self, wrapped_task: ITask, truncate_length: int = 200):
+        super().__init__(wrapped_task)
+        self.truncate_length = truncate_length
+
+    # Reusar los helpers de LoggingDecorator (operan solo sobre self.truncate_length)
+    _sanitize_params = LoggingDecorator._sanitize_params
+    _truncate_result = LoggingDecorator._truncate_result
+
+    def run(self, context: Dict[str, Any], params: Dict[str, Any]) -> Any:
+        task_name = self._wrapped_task.__class__.__name__
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        timer = _Timer()
+
+        if log_info:
+            self.logger.info(
+                f"📋 [{task_name}] Parámetros:\n"
+                f"{_dumps_pretty(self._sanitize_params(params))}"
+            )
+            self.logger.info("⏱️  [%s] Iniciando ejecución...", task_name)
+
+        try:
+            with timer:
+                result = self._wrapped_run(context, params)
+        except Exception as e:
+            self.logger.error("❌ [%s] Falló después de %.3fs", task_name, timer.duration)
+            self.logger.error(
+                f"💥 [{task_name}] Error:\n"
+                f"  Tipo: {type(e).__name__}\n"
+                f"  Mensaje: {str(e)}"
+            )
+            raise
+
+        if isinstance(result, dict):
+            result["_execution_time_ns"] = timer.duration_ns
+            result["_execution_time_seconds"] = round(timer.duration, 3)
+
+        if log_info:
+            self.logger.info("✅ [%s] Completada en %.3fs", task_name, timer.duration)
+            self.logger.info(
+                f"📤 [{task_name}] Resultado:\n"
+                f"{_dumps_pretty(self._truncate_result(result))}"
+            )
+
+        return result
+
+
+# Cadenas de decoradores con versión fusionada: clave = tupla en el orden
+# de aplicación de TASK_DECORATOR_MAP, valor = clase de un solo frame.
+FUSED_DECORATOR_CHAINS = {
+    (TimeDecorator, LoggingDecorator): FusedTimeLoggingDecorator,
+}
+
+
 class RetryDecorator(TaskDecorator):
     """
     Decorador que reintenta la tarea si falla.
@@ -175,40 +290,41 @@ class RetryDecorator(TaskDecorator):
         wrapped_task: ITask,
         max_retries: int = 3,
         delay_seconds: float = 1.0,
-        backoff_multiplier: float = 2.0
+        backoff_multiplier: float = 2.0,
+        stop_event: Optional[threading.Event] = None
     ):
         super().__init__(wrapped_task)
         self.max_retries = max_retries
         self.delay_seconds = delay_seconds
         self.backoff_multiplier = backoff_multiplier
-    
+        # Espera interrumpible entre reintentos: un Event inyectado (p.ej.
+        # el de parada del servicio) despierta los backoffs en el shutdown
+        # en vez de dejar el hilo bloqueado en time.sleep.
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
+
     def run(self, context: Dict[str, Any], params: Dict[str, Any]) -> Any:
         """Ejecuta con reintentos exponenciales"""
         task_name = self._wrapped_task.__class__.__name__
         last_exception = None
+        last_result = None
         current_delay = self.delay_seconds
-        
+
         for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                self.logger.warning(
+                    f"🔄 [{task_name}] Reintento {attempt}/{self.max_retries} "
+                    f"después de {current_delay:.1f}s"
+                )
+                if self._stop_event.wait(current_delay):
+                    self.logger.warning(f"⏹️ [{task_name}] Reintentos interrumpidos por parada")
+                    break
+                current_delay *= self.backoff_multiplier
+
             try:
-                if attempt > 0:
-                    self.logger.warning(
-                        f"🔄 [{task_name}] Reintento {attempt}/{self.max_retries} "
-                        f"después de {current_delay:.1f}s"
-                    )
-                    time.sleep(current_delay)
-                    current_delay *= self.backoff_multiplier
-                
-                # Intentar ejecutar
-                result = self._wrapped_task.run(context, params)
-                
-                if attempt > 0:
-                    self.logger.info(f"✅ [{task_name}] Éxito en intento {attempt + 1}")
-                
-                return result
-                
+                result = self._wrapped_run(context, params)
             except Exception as e:
                 last_exception = e
-                
+
                 if attempt < self.max_retries:
                     self.logger.warning(
                         f"⚠️  [{task_name}] Intento {attempt + 1} falló: {e}"
@@ -218,7 +334,28 @@ class RetryDecorator(TaskDecorator):
                         f"❌ [{task_name}] Todos los intentos fallaron después de "
                         f"{self.max_retries + 1} intentos"
                     )
-        
-        # Si llegamos aquí, todos los intentos fallaron
-        raise last_exception
+                continue
+
+            # Fallo «blando»: on_error de la tarea devolvió un dict con
+            # success=False en vez de relanzar. Se reintenta por estado,
+            # sin pagar el camino de excepción.
+            if isinstance(result, dict) and result.get("success") is False:
+                last_exception = None
+                last_result = result
+                if attempt < self.max_retries:
+                    self.logger.warning(
+                        f"⚠️  [{task_name}] Intento {attempt + 1} sin éxito: "
+                        f"{result.get('error', 'sin detalle')}"
+                    )
+                continue
+
+            if attempt > 0:
+                self.logger.info(f"✅ [{task_name}] Éxito en intento {attempt + 1}")
+
+            return result
+
+        # Si llegamos aquí, todos los intentos fallaron (o se interrumpió)
+        if last_exception is not None:
+            raise last_exception
+        return last_result
 
@@ -0,0 +1,50 @@
+# worker/logging_setup.py
+"""
+Configuración de logging con cola para el Worker.
+
+Los handlers síncronos escriben a stdout bajo un lock global, lo que
+serializa a todos los hilos cuando el Worker ejecuta tareas en paralelo.
+Aquí los registros se encolan (QueueHandler) y un hilo de fondo
+(QueueListener) hace la E/S, sacando el flush del camino caliente.
+"""
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+_listener: QueueListener | None = None
+
+
+def setup_queue_logging(level: int = logging.INFO) -> None:
+    """
+    Instala un QueueHandler en el logger raíz y arranca el QueueListener.
+    Idempotente: llamadas repetidas no duplican handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    queue: SimpleQueue = SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    # Reemplazar handlers síncronos existentes por el handler de cola
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(queue))
+
+    _listener = QueueListener(queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_queue_logging)
+
+
+def stop_queue_logging() -> None:
+    """Detiene el listener y drena los registros pendientes."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
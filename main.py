@@ -11,8 +11,6 @@ import logging
 # Agregar el directorio raíz al path para imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from service.worker_service import WorkerService
-
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -52,7 +50,11 @@ def parse_args():
 def main():
     """Función principal"""
     args = parse_args()
-    
+
+    # Import diferido: parse_args (y --help) no pagan el arranque del stack
+    # completo del servicio (engine, estrategias, SQLModel).
+    from service.worker_service import WorkerService
+
     # Banner
     print("=" * 70)
     print("  🤖 WORKER SERVICE - Workflow Execution Engine")
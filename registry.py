@@ -1,6 +1,10 @@
 from strategies.base import ITask
 from FactoryM import TaskFactoryDirector
-from typing import Type, Dict
+from typing import Type, Dict, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 class Taskregistry():
@@ -8,47 +12,66 @@ class Taskregistry():
     Implementa el Factory Method para crear catálogo de estrategias de tareas disponibles en el sistema.
     Permite registrar y crear instancias de tareas concretas.
     El metodo create implementa factory method para obtener la instancia a utilizar
+
+    Las escrituras (register/clear) son copy-on-write bajo lock: se
+    construye un dict nuevo y se reemplaza de forma atómica, así los
+    hilos lectores de create()/list() nunca ven un dict a medio mutar
+    ni contienden por el lock en el camino caliente.
     """
 
+    __slots__ = ("_registry", "_snapshot", "_lock")
+
     def __init__(self):
         self._registry: Dict[str, Type[ITask]] = {}
-    
-    def register(self, task_name:str):
+        self._snapshot: Tuple[Type[ITask], ...] = ()
+        self._lock = threading.Lock()
+
+    def register(self, task_name: str):
         """
         Registra una clase concreta de tarea en el catálogo global.
         Debe tener un atributo 'type' único.
         """
-        TaskFactory= TaskFactoryDirector()
-
-        if task_name not in TaskFactory.All_posible_tasks:
+        if task_name not in TaskFactoryDirector.All_posible_tasks:
             raise ValueError(f"La clase {task_name} no está definida como tarea.")
 
-        if task_name in self._registry:
-            raise ValueError(f"El tipo de tarea '{task_name}' ya está registrado.")
-        
-        Taskclas=TaskFactory.create(task_name).__class__
-        self._registry[task_name] = Taskclas
-        print(f"[Taskregistry] Registrada tarea: {task_name}")
+        with self._lock:
+            if task_name in self._registry:
+                raise ValueError(f"El tipo de tarea '{task_name}' ya está registrado.")
+
+            Taskclas = TaskFactoryDirector.resolve_class(task_name)
+            new_registry = dict(self._registry)
+            new_registry[task_name] = Taskclas
+            self._registry = new_registry
+            self._snapshot = tuple(new_registry.values())
+        logger.debug("[Taskregistry] Registrada tarea: %s", task_name)
+
+    def register_many(self, task_names: "list[str]"):
+        """
+        Registra varias tareas en una sola pasada.
+        Mismas validaciones que register, compartiendo el director.
+        """
+        for task_name in task_names:
+            self.register(task_name)
 
-    
     def create(self, task_type: str) -> ITask:
         """Devuelve la instancia de la clase Task (concreteproduct) a utlizar"""
-        if task_type not in self._registry:
+        registry = self._registry  # lectura atómica del snapshot vigente
+        if task_type not in registry:
             raise ValueError(f"Unknown task type: {task_type}")
-        return self._registry[task_type]()
-    
-    def list(self) -> list[Type[ITask]]:
+        return registry[task_type]()
+
+    def list(self) -> "Tuple[Type[ITask], ...]":
         """
-        Devuelve una lista de todas las clases de tareas registradas.
+        Devuelve una tupla de todas las clases de tareas registradas.
         (Usado por el endpoint /task-types para el frontend)
         """
-        return list(self._registry.values())
-
+        return self._snapshot
 
     def clear(self):
         """
         Limpia el registro actual (útil en tests).
         """
-        self._registry.clear()
-        print("[Taskregistry] 🧹 Registro limpiado.")
-
+        with self._lock:
+            self._registry = {}
+            self._snapshot = ()
+        logger.debug("[Taskregistry] 🧹 Registro limpiado.")
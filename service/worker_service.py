@@ -5,6 +5,7 @@ No requiere comunicación HTTP, lee workflows pendientes de la misma BD SQLite.
 """
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 from typing import Optional, Dict, Any, List
 import logging, json
@@ -20,6 +21,8 @@ if sys.platform == 'win32' and hasattr(sys.stdout, 'reconfigure'):
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 from sqlmodel import Session, select
+from sqlalchemy import event, text
+from sqlalchemy.orm import scoped_session, sessionmaker
 from Models.shared_workflow_table import workflowTable
 from workflow.workflow_engine import WorkflowEngine
 from workflow.workflow_persistence import WorkflowRepository
@@ -27,12 +30,139 @@ from workflow.workflow_models import WorkflowNode, WorkflowDefinition
 from worker_engine import WorkerEngine
 from registry import Taskregistry
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from logging_setup import setup_queue_logging
+
+# (De)codificación JSON de `definition`: msgspec u orjson (implementados en
+# C) si alguno está disponible, con fallback al json de la stdlib. La columna
+# sigue siendo TEXT porque el esquema se comparte con la API, que serializa
+# con json.dumps.
+# default=str / enc_hook=str en los tres caminos: los resultados pueden
+# traer tipos no-JSON (datetime, bytes) y la escritura a BD no debe fallar
+# con TypeError por un valor accesorio.
+try:
+    import msgspec.json as _msgspec_json
+
+    _json_loads = _msgspec_json.Decoder(dict).decode
+    _msgspec_encode = _msgspec_json.Encoder(enc_hook=str).encode
+
+    def _json_dumps(obj: Any) -> str:
+        return _msgspec_encode(obj).decode()
+except ImportError:
+    try:
+        import orjson as _orjson
+
+        _json_loads = _orjson.loads
+
+        def _json_dumps(obj: Any) -> str:
+            return _orjson.dumps(obj, default=str).decode()
+    except ImportError:
+        _json_loads = json.loads
+
+        def _json_dumps(obj: Any) -> str:
+            return json.dumps(obj, default=str)
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _parse_definition(wf_id: str, updated_at: str, raw: str) -> Dict[str, Any]:
+    """
+    Parsea la definición de un workflow memoizando por (id, updated_at).
+
+    Un workflow puede permanecer 'en_espera' durante muchos ciclos de
+    polling; mientras la fila no cambie (updated_at estable) el TEXT es el
+    mismo y el parseo se hace una sola vez en lugar de una vez por ciclo.
+    """
+    return _json_loads(raw)
+
+# Logging con cola: la E/S de los registros corre en un hilo de fondo
+# en lugar de bloquear el hilo que ejecuta las tareas.
+setup_queue_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tablas estáticas de mapeo API <-> Worker, construidas una vez a nivel de
+# módulo: cada llamada es un único dict.get en vez de recrear el dict.
+_STEP_TYPE_MAP: Dict[str, str] = {
+    "HTTPS GET Request": "http_get",
+    "Validate CSV File": "validate_csv",
+    "Simple Transform": "transform_simple",
+    "Save to Database": "save_db",
+    "Mock Notification": "notify_mock",
+}
+# Fallback snake_case para tipos desconocidos, precompilado.
+_SNAKE_TRANS = str.maketrans(" ", "_")
+
+_WORKER_TO_API_STATUS: Dict[str, str] = {
+    "SUCCESS": "completado",
+    "FAILED": "fallido",
+    "PARTIAL_SUCCESS": "completado",
+    "RUNNING": "en_progreso",
+}
+
+
+# Sentencias construidas UNA vez a nivel de módulo: montar el árbol de
+# expresión del select (o parsear el SQL crudo) en cada ciclo de polling es
+# coste de Python que no cambia entre llamadas.
+_PENDING_STMT = select(
+    workflowTable.id,
+    workflowTable.name,
+    workflowTable.status,
+    workflowTable.created_at,
+    workflowTable.updated_at,
+    workflowTable.definition,
+).where(workflowTable.status == "en_espera")
+
+_CLAIM_STMT = text(
+    "UPDATE workflowtable "
+    "SET status='en_progreso', updated_at=:ts "
+    "WHERE id IN (SELECT id FROM workflowtable "
+    "WHERE status='en_espera' ORDER BY created_at LIMIT :n) "
+    "RETURNING id, name, created_at, updated_at, definition"
+)
+
+_UPDATE_STATUS_STMT = text(
+    "UPDATE workflowtable SET status=:status, updated_at=:ts "
+    "WHERE id=:id RETURNING id"
+)
+
+_UPDATE_STATUS_RESULTS_STMT = text(
+    "UPDATE workflowtable SET status=:status, updated_at=:ts, "
+    "definition=json_set(COALESCE(definition, '{}'), "
+    "'$.execution_results', json(:results), "
+    "'$.executed_at', :executed) "
+    "WHERE id=:id RETURNING id"
+)
+
+
+# Espera adaptativa entre ciclos: mientras la BD esté "recién activa" se
+# sondea PRAGMA data_version cada pocos ms (despierta casi al instante
+# cuando la API inserta un workflow); tras varios ciclos sin trabajo se
+# vuelve al intervalo completo para dejar la CPU en reposo.
+_DATA_VERSION_PROBE_INTERVAL = 0.05
+_IDLE_CYCLES_BEFORE_SLOW_POLL = 10
+
+
+def _tune_sqlite_engine(engine) -> None:
+    """
+    Aplica PRAGMAs de rendimiento a cada conexión nueva del engine:
+    WAL evita el fsync del journal en cada COMMIT y deja que lectores y
+    escritores no se bloqueen entre sí (necesario para el pool de
+    workflows en paralelo); synchronous=NORMAL es seguro con WAL;
+    busy_timeout reintenta en vez de devolver SQLITE_BUSY cuando varios
+    hilos escriben a la vez.
+    """
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 
 class WorkerService:
     """
@@ -43,8 +173,9 @@ class WorkerService:
     def __init__(
         self,
         shared_db_path: str = "database.db",  # ← Misma BD que usa la API
-        poll_interval: float = 3.0, 
-        worker_db_path: str = "data/worker_workflows.db"  # ← BD propia del worker para logs
+        poll_interval: float = 3.0,
+        worker_db_path: str = "data/worker_workflows.db",  # ← BD propia del worker para logs
+        parallelism: Optional[int] = None
 
     ):
         """
@@ -52,12 +183,33 @@ class WorkerService:
             shared_db_path: Ruta a la BD compartida con la API (database.db)
             poll_interval: Intervalo de polling en segundos
             worker_db_path: Ruta a la BD propia del worker para persistir ejecuciones
+            parallelism: Workflows independientes ejecutados en paralelo por
+                ciclo; por defecto 2×CPUs (dominados por I/O, no por cómputo)
         """
         self.shared_db_path = shared_db_path
         self.poll_interval = poll_interval
+        if parallelism is None:
+            parallelism = min(8, (os.cpu_count() or 2) * 2)
+        self.parallelism = max(1, parallelism)
         self._stop_flag = False
         self._polling_thread: Optional[threading.Thread] = None
-        self._is_stopped = False  
+        self._is_stopped = False
+        # Se activa cuando el loop de polling termina: permite que stop()
+        # (y los tests) esperen la salida real del hilo sin sleeps fijos.
+        self._stopped = threading.Event()
+        # Los workflows de un ciclo se ejecutan en un pool de hilos (son
+        # independientes y dominados por I/O); el lock protege self.stats.
+        self._workflow_pool: Optional[ThreadPoolExecutor] = None
+        self._stats_lock = threading.Lock()
+        # Estado del sondeo adaptativo por data_version (solo lo toca el
+        # hilo de polling).
+        self._last_data_version: Optional[int] = None
+        self._idle_cycles = 0
+        # Conexión dedicada del sondeo (ver _db_data_version): data_version
+        # es un contador POR CONEXIÓN, así que hay que leerlo siempre desde
+        # la misma.
+        self._probe_conn = None
+        self._probe_conn_engine = None
 
         # Importar el modelo de la API
         from sqlmodel import create_engine, SQLModel
@@ -68,6 +220,14 @@ class WorkerService:
             f"sqlite:///{shared_db_path}",
             connect_args={"check_same_thread": False}
         )
+        _tune_sqlite_engine(self.shared_engine)
+        self._ensure_claim_index()
+
+        # Sesión thread-local reutilizada entre llamadas (ver _get_session):
+        # abrir un Session nuevo por operación paga construcción + checkout
+        # de conexión en cada ciclo de polling.
+        self._session_factory = None
+        self._session_bound_engine = None
 
         # Componentes del Worker
         self.registry = Taskregistry()
@@ -75,6 +235,9 @@ class WorkerService:
         
         self.worker_engine = WorkerEngine(self.registry)
         self.repo = WorkflowRepository(shared_db_path)
+        # Mismos PRAGMAs para el engine del repositorio: sus commits de
+        # noderun/workflowrun son los más frecuentes del servicio.
+        _tune_sqlite_engine(self.repo.engine)
         self.workflow_engine = WorkflowEngine(self.worker_engine, self.repo)
 
         # Estadísticas
@@ -85,24 +248,67 @@ class WorkerService:
             "started_at": None
         }
 
-        logger.info(f"[WorkerService] 🚀 Inicializado")
+        logger.info("[WorkerService] 🚀 Inicializado")
         logger.info(f"[WorkerService] 📁 BD compartida: {shared_db_path}")
         logger.info(f"[WorkerService] 📁 BD usada para TODO (workflows + ejecuciones): {shared_db_path}")
         logger.info(f"[WorkerService] ⏱️  Poll interval: {poll_interval}s")
 
+    def _ensure_claim_index(self) -> None:
+        """
+        Garantiza el índice (status, created_at) sobre workflowtable.
+
+        El modelo lo declara en __table_args__, pero la tabla compartida la
+        crea la API: si su esquema no lo incluye, el claim degenera en scan
+        + sort por ciclo. CREATE INDEX IF NOT EXISTS es idempotente y
+        gratis cuando ya existe.
+        """
+        try:
+            with self.shared_engine.connect() as conn:
+                conn.exec_driver_sql(
+                    "CREATE INDEX IF NOT EXISTS ix_workflow_status_created "
+                    "ON workflowtable (status, created_at)"
+                )
+                conn.commit()
+        except Exception as e:
+            # La tabla puede no existir aún (API sin arrancar): el claim
+            # fallará igual y el índice se declarará cuando exista.
+            logger.debug("[WorkerService] Índice de claim no creado aún: %s", e)
+
     def _register_tasks(self):
         """Registra todas las tareas disponibles"""
         try:
-            self.registry.register("http_get")
-            self.registry.register("validate_csv")
-            self.registry.register("transform_simple")
-            self.registry.register("save_db")
-            self.registry.register("notify_mock")
+            self.registry.register_many([
+                "http_get",
+                "validate_csv",
+                "transform_simple",
+                "save_db",
+                "notify_mock",
+            ])
             logger.info("[WorkerService] ✅ Tareas registradas correctamente")
         except Exception as e:
             logger.error(f"[WorkerService] ❌ Error registrando tareas: {e}")
             raise
 
+    def _get_session(self) -> Session:
+        """
+        Devuelve la sesión thread-local para la BD compartida.
+
+        La scoped_session se (re)construye si shared_engine cambió desde
+        la última llamada (los tests inyectan su propio engine tras
+        construir el servicio). expire_on_commit=False evita re-SELECTs
+        al tocar atributos tras el commit.
+        """
+        if self._session_bound_engine is not self.shared_engine:
+            if self._session_factory is not None:
+                self._session_factory.remove()
+            self._session_factory = scoped_session(sessionmaker(
+                bind=self.shared_engine,
+                class_=Session,
+                expire_on_commit=False,
+            ))
+            self._session_bound_engine = self.shared_engine
+        return self._session_factory()
+
     def _get_pending_workflows_from_db(self) -> List[Dict[str, Any]]:
         """
         Lee workflows pendientes directamente de la BD compartida.
@@ -111,27 +317,70 @@ class WorkerService:
             Lista de workflows con estado 'en_espera'
         """
         try:
-            with Session(self.shared_engine) as session:
-                # Buscar workflows con estado 'en_espera'
-                stmt = select(workflowTable).where(workflowTable.status == "en_espera")
-                records = session.exec(stmt).all()
-                # Convertir a diccionarios
-                workflows = []
-                for record in records:
-                    workflows.append({
-                        "id": record.id,
-                        "name": record.name,
-                        "status": record.status,
-                        "created_at": record.created_at,
-                        "definition": json.loads(record.definition) if record.definition else {}
-                    })
-                
-                return workflows
-                
+            session = self._get_session()
+            with session.begin():
+                # Buscar workflows con estado 'en_espera'. Se seleccionan las
+                # columnas sueltas y se consumen como mappings: filas sin
+                # hidratar objetos ORM completos (bastante más barato por fila
+                # en el ciclo de polling).
+                rows = session.execute(_PENDING_STMT).mappings().all()
+
+                return [
+                    {
+                        "id": row["id"],
+                        "name": row["name"],
+                        "status": row["status"],
+                        "created_at": row["created_at"],
+                        "definition": _parse_definition(row["id"], row["updated_at"], row["definition"])
+                        if row["definition"] else {}
+                    }
+                    for row in rows
+                ]
+
+        except Exception as e:
+            logger.error("[WorkerService] ❌ Error leyendo BD: %s", e)
+            return []
+
+    def _claim_pending_workflows(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Reclama atómicamente hasta `limit` workflows 'en_espera' (los más
+        antiguos primero).
+
+        Un único UPDATE ... RETURNING (SQLite >= 3.35) pasa las filas a
+        'en_progreso' y las devuelve en la misma sentencia: dos workers
+        concurrentes nunca reclaman el mismo workflow y el lote completo
+        cuesta un solo round-trip en lugar de SELECT + UPDATE por fila.
+
+        Returns:
+            Lista de workflows reclamados (vacía si no hay pendientes).
+        """
+        now = datetime.now(UTC).replace(microsecond=0).isoformat()
+        try:
+            session = self._get_session()
+            with session.begin():
+                rows = session.execute(_CLAIM_STMT, {"ts": now, "n": limit}).all()
+
+                return [
+                    {
+                        "id": wf_id,
+                        "name": name,
+                        "status": "en_progreso",
+                        "created_at": created_at,
+                        "definition": _parse_definition(wf_id, updated_at, definition)
+                        if definition else {}
+                    }
+                    for wf_id, name, created_at, updated_at, definition in rows
+                ]
+
         except Exception as e:
-            logger.error(f"[WorkerService] ❌ Error leyendo BD: {e}")
+            logger.error("[WorkerService] ❌ Error reclamando workflows: %s", e)
             return []
 
+    def _claim_next_workflow(self) -> Optional[Dict[str, Any]]:
+        """Reclama el siguiente workflow pendiente, o None si no hay."""
+        claimed = self._claim_pending_workflows(limit=1)
+        return claimed[0] if claimed else None
+
     def _update_workflow_status_in_db(
         self, 
         workflow_id: str, 
@@ -149,36 +398,41 @@ class WorkerService:
         Returns:
             True si se actualizó exitosamente
         """
-       
+        now = datetime.now(UTC)
+        params: Dict[str, Any] = {
+            "id": workflow_id,
+            "status": status,
+            "ts": now.replace(microsecond=0).isoformat(),
+        }
+
+        # Un único UPDATE ... RETURNING: los resultados se insertan en la
+        # definición con json_set (SQLite >= 3.38) en la propia sentencia,
+        # sin el SELECT + mutación en Python + UPDATE anterior (3 round-trips
+        # reducidos a 1). RETURNING sin fila == workflow inexistente.
+        if results:
+            stmt = _UPDATE_STATUS_RESULTS_STMT
+            # ResultTable (SoA) → vista dict por referencia para el codec JSON
+            if not isinstance(results, dict):
+                results = results.to_dict()
+            params["results"] = _json_dumps(results)
+            params["executed"] = now.isoformat()
+        else:
+            stmt = _UPDATE_STATUS_STMT
+
         try:
-            with Session(self.shared_engine) as session:
-                stmt = select(workflowTable).where(workflowTable.id == workflow_id)
-                record = session.exec(stmt).first()
-                
-                if not record:
-                    logger.warning(f"[WorkerService] ⚠️ Workflow {workflow_id} no encontrado")
+            session = self._get_session()
+            with session.begin():
+                row = session.execute(stmt, params).first()
+
+                if row is None:
+                    logger.warning("[WorkerService] ⚠️ Workflow %s no encontrado", workflow_id)
                     return False
-                
-                # Actualizar estado
-                record.status = status
-                record.updated_at = datetime.now(UTC).replace(microsecond=0).isoformat()
-                
-                # Si hay resultados, agregarlos a la definición
-                if results:
-                    current_def = json.loads(record.definition) if record.definition else {}
-                    current_def["execution_results"] = results
-                    current_def["executed_at"] = datetime.now(UTC).isoformat()
-                    record.definition = json.dumps(current_def)
-                
-                session.add(record)
-                session.commit()
-                session.refresh(record)
-                
-                logger.debug(f"[WorkerService] 💾 Estado de {workflow_id} actualizado a '{status}'")
+
+                logger.debug("[WorkerService] 💾 Estado de %s actualizado a '%s'", workflow_id, status)
                 return True
-                
+
         except Exception as e:
-            logger.error(f"[WorkerService] ❌ Error actualizando BD: {e}")
+            logger.error("[WorkerService] ❌ Error actualizando BD: %s", e)
             return False
 
     def _convert_api_workflow_to_definition(self, api_workflow: Dict[str, Any]) -> WorkflowDefinition:
@@ -205,19 +459,23 @@ class WorkerService:
                 for node in nodes_data
             ]
         else:
-            # Legacy: Convert from steps
+            # Legacy: Convert from steps. Los params se pasan por referencia
+            # (aguas abajo solo se leen) y el método de mapeo se fija en una
+            # local. Los ids step_N se generan una sola vez: cada nodo
+            # referencia el string ya construido en vez de re-formatear
+            # f-strings para el id y para el depends_on del siguiente.
+            _map = self._map_step_type
             steps = definition.get("steps", [])
-            nodes = []
-            for i, step in enumerate(steps):
-                api_type = step.get("type", "")
-                worker_type = self._map_step_type(api_type)
-                node = WorkflowNode(
-                    id=f"step_{i}",
-                    type=worker_type,
+            ids = [f"step_{i}" for i in range(len(steps))]
+            nodes = [
+                WorkflowNode(
+                    id=ids[i],
+                    type=_map(step.get("type", "")),
                     params=step.get("args", {}),
-                    depends_on=[f"step_{i-1}"] if i > 0 else []
+                    depends_on=[ids[i - 1]] if i else []
                 )
-                nodes.append(node)
+                for i, step in enumerate(steps)
+            ]
 
         return WorkflowDefinition(
             name=api_workflow.get("name", "unnamed_workflow"),
@@ -229,56 +487,47 @@ class WorkerService:
         """
         Mapea tipos de tareas de la API a tipos del Worker.
         """
-        mapping = {
-            "HTTPS GET Request": "http_get",
-            "Validate CSV File": "validate_csv",
-            "Simple Transform": "transform_simple",
-            "Save to Database": "save_db",
-            "Mock Notification": "notify_mock"
-        }
-        
-        result = mapping.get(api_type)
+        result = _STEP_TYPE_MAP.get(api_type)
         if not result:
-            logger.warning(f"[WorkerService] ⚠️ Tipo desconocido '{api_type}', usando como está")
-            result = api_type.lower().replace(" ", "_")
-        
+            logger.warning("[WorkerService] ⚠️ Tipo desconocido '%s', usando como está", api_type)
+            result = api_type.lower().translate(_SNAKE_TRANS)
+
         return result
 
     def _map_worker_status_to_api(self, worker_status: str) -> str:
         """
         Mapea estados del Worker a estados de la API.
         """
-        mapping = {
-            "SUCCESS": "completado",
-            "FAILED": "fallido",
-            "PARTIAL_SUCCESS": "completado",
-            "RUNNING": "en_progreso"
-        }
-        return mapping.get(worker_status, "fallido")
+        return _WORKER_TO_API_STATUS.get(worker_status, "fallido")
 
-    def _execute_workflow(self, api_workflow: Dict[str, Any]) -> bool:
+    def _execute_workflow(self, api_workflow: Dict[str, Any], already_claimed: bool = False) -> bool:
         """
         Ejecuta un workflow individual.
-        
+
+        Args:
+            api_workflow: Workflow en formato de la API
+            already_claimed: True si el workflow ya fue pasado a
+                'en_progreso' por _claim_next_workflow (evita un UPDATE extra)
+
         Returns:
             True si se procesó exitosamente, False en caso contrario
         """
         workflow_id = api_workflow["id"]
         workflow_name = api_workflow["name"]
 
-        logger.info(f"[WorkerService] 📥 Procesando workflow: {workflow_name} (ID: {workflow_id})")
+        logger.info("[WorkerService] 📥 Procesando workflow: %s (ID: %s)", workflow_name, workflow_id)
 
         try:
-            # 1. Marcar como 'en_progreso'
-            if not self._update_workflow_status_in_db(workflow_id, "en_progreso"):
-                logger.warning(f"[WorkerService] ⚠️ No se pudo reclamar workflow {workflow_id}")
+            # 1. Marcar como 'en_progreso' (salvo que el claim atómico ya lo hiciera)
+            if not already_claimed and not self._update_workflow_status_in_db(workflow_id, "en_progreso"):
+                logger.warning("[WorkerService] ⚠️ No se pudo reclamar workflow %s", workflow_id)
                 return False
 
             # 2. Convertir a formato del Worker
             workflow_def = self._convert_api_workflow_to_definition(api_workflow)
 
             # 3. Ejecutar workflow
-            logger.info(f"[WorkerService] ▶️ Ejecutando workflow: {workflow_name}")
+            logger.info("[WorkerService] ▶️ Ejecutando workflow: %s", workflow_name)
             result = self.workflow_engine.run(workflow_def)
 
             # 4. Mapear resultado al formato de la API
@@ -292,24 +541,22 @@ class WorkerService:
                 results=result.results
             )
             if not success:
-                logger.error(f"[WorkerService] ❌ Error actualizando estado de {workflow_name}")
-                self.stats["failed"] += 1
-                self.stats["total_processed"] += 1
+                logger.error("[WorkerService] ❌ Error actualizando estado de %s", workflow_name)
+                self._record_result(ok=False)
                 return False
-            
-            self.stats["total_processed"] += 1  
+
             if api_status == "completado":
-                logger.info(f"[WorkerService] ✅ Workflow {workflow_name} completado: {api_status}")
-                self.stats["successful"] += 1
+                logger.info("[WorkerService] ✅ Workflow %s completado: %s", workflow_name, api_status)
+                self._record_result(ok=True)
                 return True
             else:
-                logger.warning(f"[WorkerService] ⚠️ Workflow {workflow_name} falló: {api_status}")
-                self.stats["failed"] += 1 
-                return False  
+                logger.warning("[WorkerService] ⚠️ Workflow %s falló: %s", workflow_name, api_status)
+                self._record_result(ok=False)
+                return False
 
 
         except Exception as e:
-            logger.error(f"[WorkerService] 💥 Error ejecutando workflow {workflow_name}: {e}", exc_info=True)
+            logger.error("[WorkerService] 💥 Error ejecutando workflow %s: %s", workflow_name, e, exc_info=True)
             # Marcar como fallido en BD
             try:
                 self._update_workflow_status_in_db(
@@ -317,46 +564,141 @@ class WorkerService:
                     status="fallido"
                 )
             except Exception as update_error:
-                logger.error(f"[WorkerService] ⚠️ No se pudo actualizar estado a 'fallido': {update_error}")
+                logger.error("[WorkerService] ⚠️ No se pudo actualizar estado a 'fallido': %s", update_error)
 
-            self.stats["failed"] += 1
-            self.stats["total_processed"] += 1
+            self._record_result(ok=False)
             return False
 
+    def _record_result(self, ok: bool) -> None:
+        """
+        Acumula el resultado de un workflow en self.stats.
+
+        Una única adquisición del lock por workflow (no una por contador):
+        los hilos del pool solo compiten aquí y durante dos incrementos.
+        """
+        with self._stats_lock:
+            self.stats["total_processed"] += 1
+            self.stats["successful" if ok else "failed"] += 1
+
+    def _get_workflow_pool(self) -> ThreadPoolExecutor:
+        """Pool de ejecución de workflows, creado de forma perezosa."""
+        if self._workflow_pool is None:
+            self._workflow_pool = ThreadPoolExecutor(
+                max_workers=self.parallelism,
+                thread_name_prefix="worker-wf"
+            )
+        return self._workflow_pool
+
     def _poll_loop(self):
         """
         Bucle principal: consulta workflows pendientes de la BD y los ejecuta.
         """
-        logger.info(f"[WorkerService] 🔄 Iniciando loop de polling...")
+        logger.info("[WorkerService] 🔄 Iniciando loop de polling...")
+        self._stopped.clear()
         self.stats["started_at"] = datetime.now(UTC).isoformat()
 
         cycle_count = 0
 
+        try:
+            self._run_poll_cycles(cycle_count)
+        finally:
+            # Señal de salida del loop, pase lo que pase: quien espere en
+            # stop() (o en los tests) despierta en cuanto el hilo termina.
+            self._stopped.set()
+
+        logger.info("[WorkerService] 🛑 Loop de polling detenido")
+
+    def _run_poll_cycles(self, cycle_count: int):
         while not self._stop_flag:
             try:
                 cycle_count += 1
-                # Consultar workflows pendientes de la BD
+                # Reclamar y procesar workflows pendientes de a uno: el claim
+                # atómico marca 'en_progreso' y devuelve la fila en la misma
+                # sentencia, así que no hace falta el SELECT masivo previo.
                 logger.debug("[WorkerService] 🔍 Consultando workflows pendientes en BD...")
-                pending_workflows = self._get_pending_workflows_from_db()
-
-                if not pending_workflows:
-                    logger.debug("[WorkerService] 💤 No hay workflows pendientes")
+                claimed_any = False
+
+                while not self._stop_flag:
+                    # Reclamar hasta `parallelism` workflows en UNA sentencia
+                    # y ejecutarlos en paralelo: son independientes entre sí
+                    # y dominados por I/O (HTTP + SQLite), así que escalan
+                    # con hilos.
+                    batch = self._claim_pending_workflows(self.parallelism)
+                    if not batch:
+                        break
+                    claimed_any = True
+
+                    if len(batch) == 1:
+                        self._execute_workflow(batch[0], already_claimed=True)
+                    else:
+                        pool = self._get_workflow_pool()
+                        list(pool.map(
+                            lambda wf: self._execute_workflow(wf, already_claimed=True),
+                            batch
+                        ))
+
+                if claimed_any:
+                    self._idle_cycles = 0
                 else:
-                    logger.info(f"[WorkerService] 📋 Encontrados {len(pending_workflows)} workflow(s) pendiente(s)")
-
-                    # Procesar cada workflow
-                    for workflow in pending_workflows:
-                        self._execute_workflow(workflow)
-                
-                logger.debug(f"[WorkerService] 😴 Durmiendo {self.poll_interval}s hasta próximo ciclo...")
+                    self._idle_cycles += 1
+                    logger.debug("[WorkerService] 💤 No hay workflows pendientes")
 
             except Exception as e:
-                logger.error(f"[WorkerService] ⚠️ Error en ciclo de polling: {e}", exc_info=True)
+                logger.error("[WorkerService] ⚠️ Error en ciclo de polling: %s", e, exc_info=True)
 
             # Esperar antes del siguiente ciclo
+            self._wait_for_next_cycle()
+
+    def _db_data_version(self) -> Optional[int]:
+        """
+        Lee PRAGMA data_version de la BD compartida.
+
+        SQLite lo incrementa cuando OTRA conexión escribe la BD, así que
+        sirve como señal barata de "hay filas nuevas" sin consultar la
+        tabla. El contador es POR CONEXIÓN: compararlo entre conexiones
+        distintas del pool no significa nada, así que el sondeo mantiene
+        una conexión dedicada de larga vida, re-abierta si shared_engine
+        cambió desde la última lectura (mismo patrón que _get_session).
+        """
+        try:
+            if self._probe_conn is None or self._probe_conn_engine is not self.shared_engine:
+                if self._probe_conn is not None:
+                    self._probe_conn.close()
+                self._probe_conn = self.shared_engine.connect()
+                self._probe_conn_engine = self.shared_engine
+            return self._probe_conn.exec_driver_sql("PRAGMA data_version").scalar()
+        except Exception:
+            if self._probe_conn is not None:
+                try:
+                    self._probe_conn.close()
+                except Exception:
+                    pass
+                self._probe_conn = None
+            return None
+
+    def _wait_for_next_cycle(self) -> None:
+        """
+        Espera entre ciclos de polling.
+
+        En vez de dormir siempre poll_interval completo, sondea
+        data_version a intervalo corto y despierta en cuanto la API
+        escribe la BD: la latencia de pickup baja de segundos a ~50 ms.
+        Tras _IDLE_CYCLES_BEFORE_SLOW_POLL ciclos sin trabajo se vuelve
+        al sleep completo para no quemar CPU con la BD en silencio.
+        """
+        if self._idle_cycles >= _IDLE_CYCLES_BEFORE_SLOW_POLL:
             time.sleep(self.poll_interval)
+            return
 
-        logger.info("[WorkerService] 🛑 Loop de polling detenido")
+        deadline = time.monotonic() + self.poll_interval
+        while not self._stop_flag and time.monotonic() < deadline:
+            version = self._db_data_version()
+            if version is not None and version != self._last_data_version:
+                known_baseline = self._last_data_version is not None
+                self._last_data_version = version
+                if known_baseline:
+                    return  # la BD cambió: reclamar ya
+            time.sleep(_DATA_VERSION_PROBE_INTERVAL)
 
     def start(self):
         """
@@ -412,14 +754,26 @@ class WorkerService:
         self._stop_flag = True
 
         if self._polling_thread:
+            # Esperar la señal de salida del loop y luego el join del hilo:
+            # despierta en cuanto el loop termina, sin sleeps fijos.
+            self._stopped.wait(timeout=5.0)
             self._polling_thread.join(timeout=5)
 
+        if self._workflow_pool is not None:
+            self._workflow_pool.shutdown(wait=True)
+            self._workflow_pool = None
+
         logger.info("[WorkerService] 🛑 Servicio detenido")
         logger.info(f"[WorkerService] 📊 Estadísticas: {self.stats}")
         
         # Cleanup
         self.registry.clear()
         try:
+            if self._session_factory is not None:
+                self._session_factory.remove()
+            if self._probe_conn is not None:
+                self._probe_conn.close()
+                self._probe_conn = None
             self.shared_engine.dispose()
             self.repo.engine.dispose()
             logger.info("[WorkerService] 🔒 Conexiones SQLite cerradas correctamente")
@@ -428,7 +782,8 @@ class WorkerService:
 
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estadísticas del servicio"""
-        return self.stats.copy()
+        with self._stats_lock:
+            return self.stats.copy()
 
 
 if __name__ == "__main__":
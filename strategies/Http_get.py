@@ -1,8 +1,50 @@
+import time
 import requests
-from typing import Any, Dict, List
-from strategies.base import ITask
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Tuple
+from strategies.base import ITask, register_task
 
+# Sesión HTTP compartida del módulo: reutiliza conexiones TCP/TLS
+# (keep-alive) entre pasos http_get del mismo workflow y entre workflows,
+# en vez de pagar handshake + slow-start en cada requests.get suelto.
+# Los reintentos siguen siendo responsabilidad del RetryDecorator.
+_http = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_http.mount("https://", _adapter)
+_http.mount("http://", _adapter)
 
+# Cache TTL de respuestas GET, a nivel de módulo y opt-in por parámetro
+# (cache_ttl > 0): memoiza el resultado completo por (url, headers) para
+# amortizar llamadas repetidas al mismo upstream durante la vida del worker.
+# Se mantiene en dict plano (orden de inserción = antigüedad) para no sumar
+# una dependencia tipo cachetools.
+_RESPONSE_CACHE: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+_RESPONSE_CACHE_MAX = 1024
+
+
+def _cache_get(key: Tuple) -> Optional[Dict[str, Any]]:
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if time.monotonic() >= expires_at:
+        _RESPONSE_CACHE.pop(key, None)
+        return None
+    # Copia por hit: los decoradores anotan el resultado in place
+    # (_execution_time_*), y devolver el dict cacheado haría que
+    # ejecuciones concurrentes compartieran (y pisaran) el mismo objeto.
+    return dict(result)
+
+
+def _cache_put(key: Tuple, result: Dict[str, Any], ttl: float) -> None:
+    if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX:
+        # Expulsar la entrada más antigua (los dict preservan orden)
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)), None)
+    # Copia también al guardar: el caller sigue mutando su resultado
+    _RESPONSE_CACHE[key] = (time.monotonic() + ttl, dict(result))
+
+
+@register_task("http_get")
 class HttpGetTask(ITask):
     """Tarea que obtiene datos de una URL"""
     """Subclase concrete del patrón template"""
@@ -17,7 +59,13 @@ class HttpGetTask(ITask):
         "type": "object",
         "properties": {
             "url": {"type": "string", "title": "URL", "format": "uri"},
-            "headers": {"type": "object", "title": "Encabezados", "additionalProperties": {"type": "string"}}
+            "headers": {"type": "object", "title": "Encabezados", "additionalProperties": {"type": "string"}},
+            "cache_ttl": {
+                "type": "number",
+                "title": "TTL de cache (segundos)",
+                "description": "Si es > 0, memoiza la respuesta por URL+headers durante ese tiempo",
+                "default": 0
+            }
         },
         "required": ["url"]
     }
@@ -37,24 +85,59 @@ class HttpGetTask(ITask):
         url = params["url"]
         headers = params.get("headers", {})
         timeout = params.get("timeout", 10)
+        cache_ttl = params.get("cache_ttl", 0)
+
+        # Cache opt-in: GETs deterministas repetidos (mismo URL+headers)
+        # se resuelven sin RTT ni re-parseo del cuerpo.
+        cache_key = (url, tuple(sorted(headers.items()))) if cache_ttl else None
+        if cache_key is not None:
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"♻️ Respuesta en cache para: {url}")
+                return cached
+
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            # stream=True: el cuerpo no se descarga al hacer la petición;
+            # cuánto se lee lo decide el bloque de abajo.
+            response = _http.get(url, headers=headers, timeout=timeout, stream=True)
             response.raise_for_status()
 
-            # Intentar parsear como JSON, si falla usar texto
-            try:
-                data = response.json()
-            except:
-                data = response.text[:500]  # Primeros 500 caracteres si no es JSON
+            content_type = response.headers.get("Content-Type", "")
+            if "json" in content_type.lower():
+                # JSON: hay que materializar el cuerpo completo para parsearlo
+                try:
+                    data = response.json()
+                except Exception:
+                    data = response.text[:500]
+                body = response.text[:500]
+            else:
+                # No-JSON: leer solo el primer bloque en vez de decodificar
+                # el cuerpo entero con .text — memoria y ancho de banda O(1)
+                # aunque el upstream devuelva megabytes.
+                chunk = next(response.iter_content(2048), b"") or b""
+                if isinstance(chunk, bytes):
+                    encoding = response.encoding or "utf-8"
+                    body = chunk.decode(encoding, errors="replace")[:500]
+                else:
+                    body = chunk[:500]
+                data = body
+                response.close()
 
-            return {
+            result = {
                 "success": True,
                 "status_code": response.status_code,
                 "data": data,  # JSON parseado o texto
-                "body": response.text[:500],  # Mantener por compatibilidad
+                "body": body,  # Mantener por compatibilidad
                 "headers": dict(response.headers),
                 "url": url
             }
+
+            # Guardar en cache salvo que el upstream lo prohíba explícitamente
+            if cache_key is not None and \
+                    "no-store" not in response.headers.get("Cache-Control", "").lower():
+                _cache_put(cache_key, result, cache_ttl)
+
+            return result
         except requests.exceptions.Timeout as e:  
             raise TimeoutError(f"Timeout al conectar a {url}: {e}")
         except requests.exceptions.ConnectionError as e:
@@ -1,6 +1,98 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Type
+import asyncio
 import logging
+import sys
+
+# Catálogo global de tareas concretas, poblado en tiempo de import por el
+# decorador register_task aplicado en el sitio de definición de cada clase.
+TASK_REGISTRY: Dict[str, "Type[ITask]"] = {}
+
+
+def register_task(name: str):
+    """Decorador de clase que registra una tarea concreta en TASK_REGISTRY."""
+    # Clave internada: el lookup del dict puede resolverse por identidad de
+    # puntero cuando el llamador también interna el tipo de tarea.
+    name = sys.intern(name)
+
+    def decorator(cls):
+        TASK_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+# Variantes especializadas de run(), cacheadas por combinación de hooks
+# sobrescritos (solo hay 4 posibles).
+_SPECIALIZED_RUNS: Dict[tuple, Any] = {}
+
+
+def _specialized_run(has_before: bool, has_after: bool):
+    """
+    Genera (y cachea) una variante de ITask.run con las ramas de los hooks
+    no sobrescritos eliminadas del bytecode: evaluación parcial sobre los
+    flags _has_before/_has_after en tiempo de creación de la clase, en vez
+    de comprobarlos en cada llamada.
+    """
+    key = (has_before, has_after)
+    fn = _SPECIALIZED_RUNS.get(key)
+    if fn is not None:
+        return fn
+
+    lines = [
+        "def run(self, context, params):",
+        "    self._execution_state['started'] = True",
+    ]
+    if has_before:
+        lines += [
+            "    try:",
+            "        self.before(context, params)",
+            "    except Exception as e:",
+            "        self.logger.warning(f\"Error en hook before(): {e}\")",
+        ]
+    lines += [
+        "    try:",
+        "        self.logger.debug(f\"Validando parámetros: {params}\")",
+        "        self.validate_params(params)",
+        "        self.logger.debug(f\"Ejecutando tarea con contexto: {list(context.keys())}\")",
+        "        result = self.execute(context, params)",
+        "        self._execution_state['completed'] = True",
+    ]
+    if has_after:
+        lines += [
+            "        try:",
+            "            self.after(result)",
+            "        except Exception as e:",
+            "            self.logger.warning(f\"Error en hook after(): {e}\")",
+        ]
+    lines += [
+        "        return result",
+        "    except Exception as e:",
+        "        self._execution_state['failed'] = True",
+        "        self._execution_state['error'] = e",
+        "        self.logger.error(f\"Error ejecutando tarea: {e}\", exc_info=True)",
+        "        try:",
+        "            error_result = self.on_error(e, context, params)",
+        "            if error_result is not None:",
+        "                return error_result",
+        "        except Exception as error_handler_exception:",
+        "            self.logger.error(",
+        "                f\"Error en on_error handler: {error_handler_exception}\",",
+        "                exc_info=True",
+        "            )",
+        "        raise",
+    ]
+
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), {"__name__": __name__}, namespace)
+    fn = namespace["run"]
+    fn.__qualname__ = f"ITask.run[before={has_before},after={has_after}]"
+    fn.__doc__ = (
+        "Variante de ITask.run especializada en __init_subclass__: mismo "
+        "flujo del Template Method, con los hooks no sobrescritos omitidos."
+    )
+    _SPECIALIZED_RUNS[key] = fn
+    return fn
+
 
 class ITask(ABC):
     """
@@ -29,7 +121,17 @@ class ITask(ABC):
     category: str = "General"
     icon: str = "box"
     params_schema: Dict[str, Any] = {}
+    # Clasificador de carga: "io" (HTTP, BD, notificaciones) o "cpu"
+    # (parsing/transformación). Lo usa el WorkerEngine para decidir cómo
+    # despachar la tarea cuando se ejecuta en paralelo.
+    kind: str = "io"
     
+    # Flags calculados por subclase: indican si la subclase sobrescribió los
+    # hooks opcionales. Permiten a run() saltarse la llamada cuando el hook
+    # es el `pass` por defecto (una llamada a método menos por ejecución).
+    _has_before: bool = False
+    _has_after: bool = False
+
     def __init__(self):
         """Constructor que inicializa logger y estado"""
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -39,7 +141,16 @@ class ITask(ABC):
             "failed": False,
             "error": None
         }
-    
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._has_before = cls.before is not ITask.before
+        cls._has_after = cls.after is not ITask.after
+        # Instalar la variante especializada de run() salvo que la subclase
+        # defina la suya propia (los decoradores concretos sí lo hacen).
+        if "run" not in cls.__dict__:
+            cls.run = _specialized_run(cls._has_before, cls._has_after)
+
     # ========== TEMPLATE METHOD (NO SOBRESCRIBIR) ==========
     
     def run(self, context: Dict[str, Any], params: Dict[str, Any]) -> Any:
@@ -65,12 +176,13 @@ class ITask(ABC):
         """
         self._execution_state["started"] = True
         
-        # Hook 1: Antes de ejecutar (opcional)
-        try:
-            self.before(context, params)
-        except Exception as e:
-            self.logger.warning(f"Error en hook before(): {e}")
-            # No detenemos la ejecución por error en hook
+        # Hook 1: Antes de ejecutar (opcional, se omite si no fue sobrescrito)
+        if self._has_before:
+            try:
+                self.before(context, params)
+            except Exception as e:
+                self.logger.warning(f"Error en hook before(): {e}")
+                # No detenemos la ejecución por error en hook
         
         try:
             # Paso 1: Validar parámetros (obligatorio)
@@ -84,12 +196,13 @@ class ITask(ABC):
             # Marcar como completado
             self._execution_state["completed"] = True
             
-            # Hook 2: Después de ejecutar exitosamente (opcional)
-            try:
-                self.after(result)
-            except Exception as e:
-                self.logger.warning(f"Error en hook after(): {e}")
-                # No afecta el resultado
+            # Hook 2: Después de ejecutar exitosamente (opcional, se omite si no fue sobrescrito)
+            if self._has_after:
+                try:
+                    self.after(result)
+                except Exception as e:
+                    self.logger.warning(f"Error en hook after(): {e}")
+                    # No afecta el resultado
             
             return result
             
@@ -116,7 +229,63 @@ class ITask(ABC):
             
             # Re-lanzar excepción para que WorkerEngine la capture
             raise
-    
+
+    # ========== CAMINO ASÍNCRONO (OPCIONAL) ==========
+
+    async def execute_async(self, context: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Versión asíncrona de execute().
+
+        Por defecto delega la implementación síncrona a un hilo con
+        asyncio.to_thread, de modo que toda tarea ya tiene camino async sin
+        cambios. Las subclases I/O pueden sobrescribirla con un cliente
+        asíncrono nativo para multiplexar N peticiones en un solo hilo.
+        """
+        return await asyncio.to_thread(self.execute, context, params)
+
+    async def run_async(self, context: Dict[str, Any], params: Dict[str, Any]) -> Any:
+        """
+        Template Method asíncrono: mismo flujo y mismos hooks que run(),
+        pero la lógica principal se await-ea vía execute_async(). Permite
+        lanzar nodos independientes con asyncio.gather sin bloquear el
+        event loop.
+        """
+        self._execution_state["started"] = True
+
+        if self._has_before:
+            try:
+                self.before(context, params)
+            except Exception as e:
+                self.logger.warning(f"Error en hook before(): {e}")
+
+        try:
+            self.validate_params(params)
+            result = await self.execute_async(context, params)
+            self._execution_state["completed"] = True
+
+            if self._has_after:
+                try:
+                    self.after(result)
+                except Exception as e:
+                    self.logger.warning(f"Error en hook after(): {e}")
+
+            return result
+
+        except Exception as e:
+            self._execution_state["failed"] = True
+            self._execution_state["error"] = e
+            self.logger.error(f"Error ejecutando tarea: {e}", exc_info=True)
+            try:
+                error_result = self.on_error(e, context, params)
+                if error_result is not None:
+                    return error_result
+            except Exception as error_handler_exception:
+                self.logger.error(
+                    f"Error en on_error handler: {error_handler_exception}",
+                    exc_info=True
+                )
+            raise
+
     # ========== MÉTODOS ABSTRACTOS (OBLIGATORIOS) ==========
     
     @abstractmethod
@@ -1,10 +1,10 @@
 import time
 from typing import Any, Dict, List
-from strategies.base import ITask
+from strategies.base import ITask, register_task
 import platform
 import subprocess
-from win10toast import ToastNotifier
 
+@register_task("notify_mock")
 class NotifyMockTask(ITask):
     """Clase para enviar una notificacion del sistema al desktop"""
     """Subclase concrete del patrón template"""
@@ -64,7 +64,9 @@ class NotifyMockTask(ITask):
         
         try:
             if sistema == "Windows":
-                # Windows 10/11 - toast notification
+                # Windows 10/11 - toast notification (import perezoso:
+                # win10toast solo existe en Windows)
+                from win10toast import ToastNotifier
                 toaster = ToastNotifier()
                 toaster.show_toast(title=titulo, msg=mensaje, duration=duration)
                 
@@ -1,9 +1,10 @@
 import sqlite3
 import os
 from typing import Any, Dict, List
-from strategies.base import ITask
+from strategies.base import ITask, register_task
 
 
+@register_task("save_db")
 class SaveDBTask(ITask):
     """Tarea para ejecutar archivo SQL generado por transform_simple en SQLite"""
     """Subclase concrete del patrón template"""
@@ -117,16 +118,25 @@ class SaveDBTask(ITask):
         self.logger.info(f"🔗 Conectando a base de datos: {db_path}")
         try:
             conn = sqlite3.connect(db_path)
+            # Transacciones manuales + pragmas de escritura: WAL evita
+            # bloquear lectores y synchronous=NORMAL ahorra un fsync por
+            # commit (seguro en WAL). Se fijan una vez por conexión.
+            conn.isolation_level = None
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
             cursor = conn.cursor()
         except sqlite3.Error as e:
             raise ConnectionError(f"No se pudo conectar a la base de datos: {e}")
 
-        # 7. Ejecutar statements SQL uno por uno con logging
+        # 7. Ejecutar statements SQL en UNA transacción: BEGIN IMMEDIATE toma
+        # el write-lock una vez y el commit paga un único fsync, en vez del
+        # ciclo de journal por statement del modo autocommit.
         executed_count = 0
         failed_count = 0
         errors = []
 
         try:
+            cursor.execute("BEGIN IMMEDIATE")
             for i, statement in enumerate(sql_statements, 1):
                 try:
                     cursor.execute(statement)
@@ -2,9 +2,21 @@ import pandas as pd
 import json
 import os
 from typing import Any, Dict, List, Optional
-from strategies.base import ITask
+from strategies.base import ITask, register_task
 
 
+def _fmt_sql_value(val: Any) -> str:
+    """Formatea un valor escalar como literal SQL (NULL, número o string escapado)."""
+    if pd.isna(val):
+        return "NULL"
+    if isinstance(val, str):
+        return "'" + val.replace("'", "''") + "'"
+    if isinstance(val, (int, float)):
+        return str(val)
+    return "'" + str(val).replace("'", "''") + "'"
+
+
+@register_task("transform_simple")
 class TransformSimpleTask(ITask):
     """Tarea para transformar JSON/CSV a SQL INSERT statements"""
     """Subclase concrete del patrón template"""
@@ -15,6 +27,7 @@ class TransformSimpleTask(ITask):
     description = "Convierte JSON o CSV a SQL INSERT statements"
     category = "Transformación"
     icon = "wand-2"
+    kind = "cpu"
     params_schema = {
         "type": "object",
         "properties": {
@@ -184,29 +197,19 @@ class TransformSimpleTask(ITask):
             + "\n);"
         )
 
-        # 5. Generar SQL INSERT statements
-        sql_statements = []
-
-        for _, row in df.iterrows():
-            # Escapar valores y manejar NULL
-            values = []
-            for col in columns:
-                val = row[col]
-                if pd.isna(val):
-                    values.append("NULL")
-                elif isinstance(val, str):
-                    # Escapar comillas simples
-                    escaped_val = val.replace("'", "''")
-                    values.append(f"'{escaped_val}'")
-                elif isinstance(val, (int, float)):
-                    values.append(str(val))
-                else:
-                    # Para otros tipos, convertir a string y escapar
-                    escaped_val = str(val).replace("'", "''")
-                    values.append(f"'{escaped_val}'")
-
-            values_str = ", ".join(values)
-            sql_statements.append(f"INSERT INTO {table_name} ({columns_str}) VALUES ({values_str});")
+        # 5. Generar SQL INSERT statements recorriendo por columnas:
+        # df[col].tolist() extrae cada columna de una vez (y convierte los
+        # tipos numpy a Python), en vez de construir una Series por fila
+        # con iterrows(), que domina el coste en DataFrames grandes.
+        formatted_cols = [
+            [_fmt_sql_value(val) for val in df[col].tolist()]
+            for col in columns
+        ]
+        insert_prefix = f"INSERT INTO {table_name} ({columns_str}) VALUES ("
+        sql_statements = [
+            insert_prefix + ", ".join(values) + ");"
+            for values in zip(*formatted_cols)
+        ]
 
         # 6. Guardar archivo SQL en directorio data/
         try:
@@ -236,9 +239,8 @@ class TransformSimpleTask(ITask):
                 # Escribir CREATE TABLE
                 f.write(create_table_statement + "\n\n")
 
-                # Escribir statements
-                for statement in sql_statements:
-                    f.write(statement + "\n")
+                # Escribir statements en un solo write (una syscall, no N)
+                f.write("\n".join(sql_statements) + "\n")
 
         except Exception as e:
             raise RuntimeError(f"Error guardando archivo SQL: {e}")
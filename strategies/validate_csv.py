@@ -1,9 +1,10 @@
 import pandas as pd
 import os
 from typing import Any, Dict, List
-from strategies.base import ITask
+from strategies.base import ITask, register_task
 
 
+@register_task("validate_csv")
 class ValidateCSVTask(ITask):
     """Tarea para validar estructura de archivos CSV"""
     """Subclase concrete del patrón template"""
@@ -14,6 +15,7 @@ class ValidateCSVTask(ITask):
     description = "Verifica que un archivo CSV tenga las columnas esperadas"
     category = "Validación"
     icon = "file-text"
+    kind = "cpu"
     params_schema = {
         "type": "object",
         "properties": {
@@ -60,21 +62,19 @@ class ValidateCSVTask(ITask):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Archivo no encontrado: {path}")
 
-        # 2. Leer CSV
+        # 2. Leer SOLO la cabecera (nrows=0): validar columnas no necesita
+        # parsear los datos, así el archivo completo no se carga en memoria.
         try:
-            df = pd.read_csv(path)
+            header = pd.read_csv(path, nrows=0)
         except pd.errors.EmptyDataError:
             raise ValueError(f"El archivo CSV está vacío: {path}")
         except Exception as e:
             raise RuntimeError(f"Error leyendo CSV: {e}")
 
-        # 3. Verificar vacío
-        if df.empty:
-            raise ValueError("El archivo CSV no contiene datos")
-
-        actual_cols = list(df.columns)
+        actual_cols = list(header.columns)
 
-        # 4. Verificar columnas solo si se especificaron
+        # 3. Verificar columnas solo si se especificaron (falla rápido,
+        # antes de pagar el parseo de las filas)
         if expected_cols and len(expected_cols) > 0:
             missing = [c for c in expected_cols if c not in actual_cols]
 
@@ -85,17 +85,28 @@ class ValidateCSVTask(ITask):
                     f"Encontradas: {actual_cols}"
                 )
 
-            # 5. Verificar columnas extra si no se permiten
+            # 4. Verificar columnas extra si no se permiten
             if not allow_extra:
                 extra = [c for c in actual_cols if c not in expected_cols]
                 if extra:
                     raise ValueError(f"Columnas no esperadas: {extra}")
 
+        # 5. Contar filas parseando una sola columna (el parser C de pandas
+        # sigue validando el formato línea a línea, con ~1/N de memoria)
+        try:
+            rows = len(pd.read_csv(path, usecols=[actual_cols[0]]))
+        except Exception as e:
+            raise RuntimeError(f"Error leyendo CSV: {e}")
+
+        # 6. Verificar vacío
+        if rows == 0:
+            raise ValueError("El archivo CSV no contiene datos")
+
         return {
             "success": True,
             "valid": True,
             "path": path,
-            "rows": len(df),
+            "rows": rows,
             "columns": actual_cols,
             "expected_columns": expected_cols if expected_cols else None,
             "has_extra_columns": len(actual_cols) > len(expected_cols) if expected_cols else False,
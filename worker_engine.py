@@ -1,18 +1,86 @@
 # worker/worker_engine.py
+import asyncio
+import logging
+import os
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from registry import Taskregistry
 from Task_command import TaskCommand
 from config.decoradores_config import TASK_DECORATOR_MAP
+from decorador import FUSED_DECORATOR_CHAINS
+
+logger = logging.getLogger(__name__)
 
 
 class WorkerEngine:
     def __init__(self, registry:Taskregistry):
         self.registry = registry
+        # Pools de ejecución creados de forma perezosa por submit_command.
+        # Las tareas I/O (HTTP, BD) van a un pool ancho; las CPU (pandas)
+        # a uno acotado al número de núcleos. Se usan hilos en ambos casos
+        # porque las tareas llevan estado no serializable (loggers,
+        # conexiones) que impide enviarlas a procesos.
+        self._io_pool = None
+        self._cpu_pool = None
+        # Cache de fábricas «tarea + cadena de decoradores» por tipo: la
+        # composición (qué clase base y qué decoradores) es fija por tipo,
+        # así que se resuelve una vez y cada comando solo instancia.
+        self._factory_cache = {}
     """
     Orquestador principal de ejecución de tareas (Worker). Ejecuta comandos encolados
-    Aplica decoradores de forma automática para instrumentar las tareas.    
+    Aplica decoradores de forma automática para instrumentar las tareas.
     """
+    def _pool_for(self, task_type: str) -> ThreadPoolExecutor:
+        """Devuelve el pool adecuado según el clasificador `kind` de la tarea."""
+        kind = getattr(self.registry._registry.get(task_type), "kind", "io") \
+            if task_type in getattr(self.registry, "_registry", {}) else "io"
+        if kind == "cpu":
+            if self._cpu_pool is None:
+                self._cpu_pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix="worker-cpu"
+                )
+            return self._cpu_pool
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix="worker-io"
+            )
+        return self._io_pool
+
+    def submit_command(self, command: TaskCommand, context=None) -> Future:
+        """
+        Despacha un comando al pool que corresponda y devuelve un Future
+        con el mismo dict de resultado que execute_command. Permite al
+        orquestador lanzar nodos independientes en paralelo.
+        """
+        pool = self._pool_for(command.type)
+        return pool.submit(self.execute_command, command, context)
+
+    async def execute_command_async(self, command: TaskCommand, context=None):
+        """
+        Versión awaitable de execute_command: despacha al pool io/cpu y
+        envuelve el Future para el event loop. Devuelve el mismo dict.
+        """
+        return await asyncio.wrap_future(self.submit_command(command, context))
+
+    async def execute_commands_async(self, commands, context=None):
+        """
+        Ejecuta varios comandos independientes de forma concurrente con
+        asyncio.gather y devuelve los resultados en el mismo orden.
+        """
+        return await asyncio.gather(
+            *(self.execute_command_async(c, context) for c in commands)
+        )
+
+    def shutdown(self):
+        """Cierra los pools de ejecución (espera a las tareas en vuelo)."""
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=True)
+            self._cpu_pool = None
     def _apply_decorators(self, task, task_id:str):
         """Aplica decoradores según el tipo de tarea."""
         decorated_task = task
@@ -24,27 +92,56 @@ class WorkerEngine:
             decorated_task = decorator_cls(decorated_task)
 
         return decorated_task
-    
+
+    def _create_decorated(self, task_type: str):
+        """
+        Crea la tarea de `task_type` con su cadena de decoradores aplicada.
+
+        La composición se memoiza por tipo: el lookup al registro y a
+        TASK_DECORATOR_MAP se paga una vez y los comandos siguientes solo
+        instancian (los decoradores llevan estado por ejecución, así que
+        las instancias sí son nuevas cada vez). La clase base se revalida
+        por identidad para respetar clear()/re-registro en tests.
+        """
+        cached = self._factory_cache.get(task_type)
+        base_cls = self.registry._registry.get(task_type)
+        if base_cls is None:
+            raise ValueError(f"Unknown task type: {task_type}")
+        if cached is None or cached[0] is not base_cls:
+            decorators = tuple(TASK_DECORATOR_MAP.get(task_type, ()))
+            # Cadena con versión fusionada: un solo decorador de un frame
+            # en lugar de N envoltorios anidados.
+            fused_cls = FUSED_DECORATOR_CHAINS.get(decorators)
+            if fused_cls is not None:
+                decorators = (fused_cls,)
+
+            def factory(base_cls=base_cls, decorators=decorators):
+                task = base_cls()
+                for decorator_cls in decorators:
+                    task = decorator_cls(task)
+                return task
+
+            cached = (base_cls, factory)
+            self._factory_cache[task_type] = cached
+        return cached[1]()
+
     def execute_command(self, command: TaskCommand, context=None):
-        print(f"[Worker] ▶️ Ejecutando {command.type} (node={command.node_key}, run={command.run_id})")
+        logger.debug("[Worker] ▶️ Ejecutando %s (node=%s, run=%s)", command.type, command.node_key, command.run_id)
         # Inicializar context si es None
         if context is None:
             context = {}    
 
-        # 1️⃣ Crear instancia de la tarea usando el registro (Factory Method indirecto)
+        # 1️⃣2️⃣ Crear la tarea ya decorada vía la fábrica memoizada por tipo
         try:
-            task = self.registry.create(command.type)
+            task = self._create_decorated(command.type)
         except ValueError as e:
-            print(f"[Worker] ❌ Error: tipo de tarea no registrada '{command.type}'")
+            logger.error("[Worker] ❌ Error: tipo de tarea no registrada '%s'", command.type)
             return {"status": "FAILED", "error": str(e)}
 
-        # 2️⃣ Aplicar decoradores
-        task = self._apply_decorators(task, command.type)
-
         # 3️⃣ Ejecutar con manejo de errores controlado
         try:
             result = task.run(context, command.params)
-            print(f"[Worker] ✅ Tarea '{command.type}' completada correctamente.")
+            logger.debug("[Worker] ✅ Tarea '%s' completada correctamente.", command.type)
             return {
                 "status": "SUCCESS",
                 "run_id": command.run_id,
@@ -54,7 +151,7 @@ class WorkerEngine:
 
         except Exception as e:
             # Captura genérica (en caso de que el decorador no haya manejado)
-            print(f"[Worker] ❌ Error ejecutando {command.type}: {e}")
+            logger.error("[Worker] ❌ Error ejecutando %s: %s", command.type, e)
             return {
                 "status": "FAILED",
                 "run_id": command.run_id,
@@ -6,14 +6,23 @@ if sys.platform == 'win32' and hasattr(sys.stdout, 'reconfigure'):
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from worker_engine import WorkerEngine
-from workflow.workflow_models import WorkflowDefinition, WorkflowResult
+from workflow.workflow_models import WorkflowDefinition, WorkflowNode, WorkflowResult, ResultTable
 from workflow.workflow_persistence import WorkflowRepository
-from Task_command import TaskCommand 
+from Task_command import TaskCommand
 import json
+import logging
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Pool compartido para los nodos de una misma «ola» del DAG: las ramas
+# independientes son I/O-bound (HTTP, fichero, BD), así que se solapan con
+# hilos. Es de módulo para no pagar la creación del pool en cada run().
+_NODE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="wf-node")
+
 class WorkflowEngine:
     """
     Orquestador de flujos de trabajo.
@@ -24,16 +33,22 @@ class WorkflowEngine:
         self.repo = repo    
 
     def run(self, workflow: WorkflowDefinition) -> WorkflowResult:
-        print(f"[WorkflowEngine] ▶️ Ejecutando workflow: {workflow.name}")
+        logger.info("[WorkflowEngine] ▶️ Ejecutando workflow: %s", workflow.name)
         start_time = datetime.now()
 
         context: Dict[str, Any] = {}
-        results: Dict[str, Any] = {}
+        # SoA: escalares por nodo en arrays contiguos, cuerpos en payload.
+        results = ResultTable()
         node_status: Dict[str, str] = {}  # SUCCESS | FAILED | SKIPPED
 
-        # 🔹 Determinar orden de ejecución según dependencias
-        pending = {node.id: node for node in workflow.nodes}
-        executed = set()
+        # 🔹 DAG precompilado en WorkflowDefinition.__post_init__: los grados
+        # de entrada se copian (se mutan durante esta ejecución) y la
+        # adyacencia de sucesores se consume tal cual. Cada iteración toma
+        # la frontera de grado cero y la despacha como una ola.
+        nodes_by_id = {node.id: node for node in workflow.nodes}
+        indeg = dict(workflow._indeg)
+        succ = workflow._succ
+        remaining = set(indeg)
 
         workflow_id = None  # se asignará después de crear el registro base
 
@@ -49,77 +64,55 @@ class WorkflowEngine:
                 started_at=start_time,
                 finished_at=start_time
             )
-        while pending:
-            progress = False
-            for node_id, node in list(pending.items()):
-                deps = node.depends_on
-                # Si alguna dependencia falló, saltar esta tarea
+        while remaining:
+            ready = [nid for nid in remaining if indeg[nid] == 0]
+            if not ready:
+                raise RuntimeError("❌ No se puede continuar: dependencias circulares o tareas bloqueadas.")
+            remaining.difference_update(ready)
+
+            # Si alguna dependencia falló, saltar la tarea (las SKIPPED
+            # cuentan como terminadas, igual que antes).
+            runnable: List[str] = []
+            for node_id in ready:
+                deps = nodes_by_id[node_id].depends_on
                 if any(node_status.get(dep) == "FAILED" for dep in deps):
-                    print(f"[WorkflowEngine] ⚠️ Saltando nodo '{node_id}' por dependencia fallida.")
+                    logger.warning("[WorkflowEngine] ⚠️ Saltando nodo '%s' por dependencia fallida.", node_id)
                     node_status[node_id] = "SKIPPED"
-                    results[node_id] = {
+                    results.append(node_id, "SKIPPED", False, 0.0, {
                         "status": "SKIPPED",
                         "reason": f"Dependencia fallida: {deps}"
-                    }
-                    executed.add(node_id)
-                    del pending[node_id]
-                    progress = True
-                    continue
-
-                # Ejecutar si todas las dependencias están completas
-                if all(dep in executed for dep in node.depends_on):
-                    node_start = datetime.now()
-
-                    # 1. Crear noderun en estado RUNNING (para progreso gradual)
-                    node_run_id = self.repo.create_node_run_running(
-                        workflow_id=workflow_id,
-                        node_id=node_id,
-                        node_type=node.type,
-                        started_at=node_start
-                    )
-
-                    print(f"[WorkflowEngine] ▶️ Ejecutando nodo: {node.id} ({node.type})")
-                    command = TaskCommand(
-                        run_id=f"{workflow.name}_{node.id}",
-                        node_key=node.id,
-                        type=node.type,
-                        params=node.params
-                    )
-
-                    # 2. Ejecutar tarea con Worker (pasar contexto con resultados de nodos previos)
-                    task_result = self.worker.execute_command(command, context=context)
-                    result_data = task_result.get("result")
-                    node_end = datetime.now()
-
-                    # 3. Determinar estado de la tarea
-                    if task_result.get("status") == "SUCCESS" and not (
-                        isinstance(result_data, dict) and result_data.get("success") is False):
-                        status = "SUCCESS"
-                        print(f"[WorkflowEngine] ✅ Nodo '{node_id}' completado correctamente.")
-                    else:
-                        status = "FAILED"
-                        print(f"[WorkflowEngine] ❌ Nodo '{node_id}' falló durante la ejecución.")
-
-                    # Guardar resultados
-                    node_status[node.id] = status
-                    results[node.id] = task_result.get("result")
-                    context[node.id] = task_result.get("result")
-
-                    # 4. Actualizar noderun con resultado final
-                    self.repo.update_node_run_completed(
-                        node_run_id=node_run_id,
-                        status=status,
-                        finished_at=node_end,
-                        result=result_data or {}
-                    )
-
-                    executed.add(node.id)
-                    del pending[node_id]
-                    progress = True
-
-            if not progress:
-                raise RuntimeError("❌ No se puede continuar: dependencias circulares o tareas bloqueadas.")
-            
+                    })
+                    for s in succ[node_id]:
+                        indeg[s] -= 1
+                else:
+                    runnable.append(node_id)
+
+            if not runnable:
+                continue
+
+            # Despachar la ola: un solo nodo se ejecuta inline (sin pagar el
+            # salto de hilo); ramas independientes se solapan en el pool y la
+            # latencia de la ola pasa de Σduraciones a max-por-nivel.
+            if len(runnable) == 1:
+                outcomes = [self._execute_node(workflow, workflow_id,
+                                               nodes_by_id[runnable[0]], context)]
+            else:
+                outcomes = list(_NODE_POOL.map(
+                    lambda nid: self._execute_node(workflow, workflow_id,
+                                                   nodes_by_id[nid], context),
+                    runnable
+                ))
+
+            for node_id, status, result_data in outcomes:
+                node_status[node_id] = status
+                exec_time = result_data.get("_execution_time_seconds", 0.0) \
+                    if isinstance(result_data, dict) else 0.0
+                results.append(node_id, status, status == "SUCCESS",
+                               exec_time, result_data)
+                context[node_id] = result_data
+                for s in succ[node_id]:
+                    indeg[s] -= 1
+
         # Determinar estado global del workflow
         end_time = datetime.now()
         if all(s == "SUCCESS" for s in node_status.values()):
@@ -137,5 +130,55 @@ class WorkflowEngine:
             finished_at=end_time
         )
 
-        print(f"[WorkflowEngine] 🏁 Workflow completado: {workflow.name} con estado {wf_status}")
+        logger.info("[WorkflowEngine] 🏁 Workflow completado: %s con estado %s", workflow.name, wf_status)
         return WorkflowResult(workflow_name=workflow.name, status=wf_status, results=results)
+
+    def _execute_node(self, workflow: WorkflowDefinition, workflow_id: int,
+                      node: WorkflowNode, context: Dict[str, Any]) -> Tuple[str, str, Any]:
+        """
+        Ejecuta un nodo y persiste su noderun. Corre en el hilo llamador o en
+        un hilo del pool; solo LEE context (los nodos de una misma ola son
+        independientes entre sí) y devuelve (node_id, status, result_data)
+        para que run() aplique las escrituras en un solo hilo.
+        """
+        node_start = datetime.now()
+
+        # 1. Crear noderun en estado RUNNING (para progreso gradual)
+        node_run_id = self.repo.create_node_run_running(
+            workflow_id=workflow_id,
+            node_id=node.id,
+            node_type=node.type,
+            started_at=node_start
+        )
+
+        logger.debug("[WorkflowEngine] ▶️ Ejecutando nodo: %s (%s)", node.id, node.type)
+        command = TaskCommand(
+            run_id=f"{workflow.name}_{node.id}",
+            node_key=node.id,
+            type=node.type,
+            params=node.params
+        )
+
+        # 2. Ejecutar tarea con Worker (pasar contexto con resultados de nodos previos)
+        task_result = self.worker.execute_command(command, context=context)
+        result_data = task_result.get("result")
+        node_end = datetime.now()
+
+        # 3. Determinar estado de la tarea
+        if task_result.get("status") == "SUCCESS" and not (
+            isinstance(result_data, dict) and result_data.get("success") is False):
+            status = "SUCCESS"
+            logger.debug("[WorkflowEngine] ✅ Nodo '%s' completado correctamente.", node.id)
+        else:
+            status = "FAILED"
+            logger.warning("[WorkflowEngine] ❌ Nodo '%s' falló durante la ejecución.", node.id)
+
+        # 4. Actualizar noderun con resultado final
+        self.repo.update_node_run_completed(
+            node_run_id=node_run_id,
+            status=status,
+            finished_at=node_end,
+            result=result_data or {}
+        )
+
+        return node.id, status, result_data
@@ -1,30 +1,154 @@
 # worker/workflow/workflow_models.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
+from array import array
+import json
 
-@dataclass
+# slots=True: sin __dict__ por instancia (menos memoria y acceso a atributo
+# más rápido); frozen=True porque los nodos y la definición son de solo
+# lectura una vez construidos.
+@dataclass(slots=True, frozen=True)
 class WorkflowNode:
     id: str
     type: str
     params: Dict[str, Any]
     depends_on: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkflowDefinition:
     name: str
     nodes: List[WorkflowNode]
     id: Optional[str] = None  # Workflow ID from API (e.g., "wf_abc123")
+    # DAG compilado una vez en __post_init__ (la definición es inmutable):
+    # grados de entrada y sucesores. El engine los consume en cada run()
+    # en vez de re-escanear depends_on nodo a nodo; las olas las deriva él
+    # dinámicamente (los nodos SKIPPED por dependencias fallidas alteran
+    # la frontera en mitad de la ejecución).
+    _indeg: Dict[str, int] = field(init=False, repr=False, compare=False,
+                                   default_factory=dict)
+    _succ: Dict[str, Tuple[str, ...]] = field(init=False, repr=False, compare=False,
+                                              default_factory=dict)
+
+    def __post_init__(self):
+        # frozen=True impide asignar atributos; los contenedores ya creados
+        # por default_factory se rellenan in place, lo que es válido.
+        indeg = {node.id: len(node.depends_on) for node in self.nodes}
+        succ: Dict[str, List[str]] = {node.id: [] for node in self.nodes}
+        for node in self.nodes:
+            for dep in node.depends_on:
+                succ.setdefault(dep, []).append(node.id)
+
+        self._indeg.update(indeg)
+        self._succ.update((nid, tuple(ids)) for nid, ids in succ.items())
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "WorkflowDefinition":
-        nodes = [WorkflowNode(**n) for n in data.get("nodes", [])]
-        return cls(
-            name=data.get("name", "Unnamed Workflow"),
-            nodes=nodes,
-            id=data.get("id")
+        """
+        Construye (o recupera) la definición desde un dict.
+
+        Memoizada sobre el JSON canónico del dict: los workflows
+        recurrentes del polling repiten la misma forma, y la definición es
+        inmutable (frozen + DAG precompilado), así que compartir la
+        instancia entre ejecuciones es seguro y se ahorra la construcción
+        de nodos y la levelización de Kahn. Dicts no serializables caen a
+        la construcción directa.
+        """
+        try:
+            key = json.dumps(data, sort_keys=True)
+        except TypeError:
+            return _build_definition(data)
+        return _definition_from_json(key)
+
+def _build_definition(data: Dict[str, Any]) -> "WorkflowDefinition":
+    # Construcción explícita campo a campo (sin **splat ni copias):
+    # params y depends_on se pasan por referencia, aguas abajo solo se leen.
+    nodes = [
+        WorkflowNode(
+            id=n["id"],
+            type=n["type"],
+            params=n.get("params", {}),
+            depends_on=n.get("depends_on", []),
         )
+        for n in data.get("nodes", [])
+    ]
+    return WorkflowDefinition(
+        name=data.get("name", "Unnamed Workflow"),
+        nodes=nodes,
+        id=data.get("id")
+    )
+
+
+@lru_cache(maxsize=256)
+def _definition_from_json(key: str) -> "WorkflowDefinition":
+    """Cache de definiciones por su JSON canónico (sort_keys)."""
+    return _build_definition(json.loads(key))
+
+
+class ResultTable:
+    """
+    Tabla de resultados por columnas (Struct-of-Arrays).
+
+    En lugar de un dict-de-dicts por nodo, los escalares van en arrays
+    tipados contiguos (status, success, exec_time) y solo los cuerpos
+    grandes quedan como dicts en `payload`. Mantiene la interfaz de
+    mapping que consumen engine/tests: `table[nid]`, `nid in table`,
+    `len(table)`, `items()`; los agregados tipo «contar éxitos» son una
+    suma sobre un array C en vez de recorrer dicts.
+    """
+    __slots__ = ("ids", "status", "success", "exec_time", "payload")
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}       # node_id -> índice de fila
+        self.status: List[str] = []
+        self.success = array("b")
+        self.exec_time = array("d")
+        self.payload: List[Any] = []
+
+    def append(self, node_id: str, status: str, success: bool,
+               exec_time: float, payload: Any) -> None:
+        self.ids[node_id] = len(self.payload)
+        self.status.append(status)
+        self.success.append(1 if success else 0)
+        self.exec_time.append(exec_time)
+        self.payload.append(payload)
+
+    # --- Interfaz de mapping (solo lectura) ---
+
+    def __getitem__(self, node_id: str) -> Any:
+        return self.payload[self.ids[node_id]]
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def get(self, node_id: str, default: Any = None) -> Any:
+        idx = self.ids.get(node_id)
+        return default if idx is None else self.payload[idx]
+
+    def keys(self):
+        return self.ids.keys()
+
+    def values(self):
+        return iter(self.payload)
+
+    def items(self):
+        return ((nid, self.payload[idx]) for nid, idx in self.ids.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Vista dict (por referencia) para serializadores JSON."""
+        return {nid: self.payload[idx] for nid, idx in self.ids.items()}
+
+    def success_count(self) -> int:
+        return sum(self.success)
+
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowResult:
     workflow_name: str
     status: str
@@ -6,6 +6,11 @@ from sqlalchemy import MetaData
 import json as json_module
 import os
 
+# UN encoder compartido (json.dumps construye uno por llamada) con
+# default=str: los resultados pueden traer tipos no-JSON accesorios
+# (datetime, bytes) y la persistencia no debe romperse por ellos.
+_encode_json = json_module.JSONEncoder(ensure_ascii=False, default=str).encode
+
 # ✅ CREAR METADATA SEPARADO para las tablas del Worker
 worker_metadata = MetaData()
 # --- MODELOS DE TABLA ---
@@ -66,7 +71,7 @@ class WorkflowRepository:
     def save_workflow_run(self, workflow_name: str, status: str, results: Dict[str, Any],
                           started_at: datetime, finished_at: datetime):
         duration = (finished_at - started_at).total_seconds()
-        summary = json_module.dumps({k: v.get("status", "OK") for k, v in results.items()}, ensure_ascii=False)
+        summary = _encode_json({k: v.get("status", "OK") for k, v in results.items()})
 
         with Session(self.engine) as session:
             run = WorkflowRun(
@@ -78,14 +83,17 @@ class WorkflowRepository:
                 result_summary=summary
             )
             session.add(run)
+            # flush asigna el PK en el propio INSERT; refresh tras commit
+            # costaría un SELECT extra solo para releer el id.
+            session.flush()
+            run_id = run.id
             session.commit()
-            session.refresh(run)
-            return run.id
+            return run_id
 
     def save_node_run(self, workflow_id: int, node_id: str, node_type: str,
                       status: str, started_at: datetime, finished_at: datetime, result: Dict[str, Any]):
         duration = (finished_at - started_at).total_seconds()
-        result_json = json_module.dumps(result, ensure_ascii=False)
+        result_json = _encode_json(result)
 
         with Session(self.engine) as session:
             node = NodeRun(
@@ -99,9 +107,10 @@ class WorkflowRepository:
                 result_data=result_json
             )
             session.add(node)
+            session.flush()
+            node_id_pk = node.id
             session.commit()
-            session.refresh(node)
-            return node.id
+            return node_id_pk
 
     def create_node_run_running(self, workflow_id: int, node_id: str, node_type: str, started_at: datetime):
         """Crea un noderun en estado RUNNING al inicio de la ejecución"""
@@ -114,16 +123,17 @@ class WorkflowRepository:
                 started_at=started_at,
                 finished_at=started_at,  # Placeholder
                 duration=0.0,
-                result_data=json_module.dumps({}, ensure_ascii=False)
+                result_data="{}"
             )
             session.add(node)
+            session.flush()
+            node_id_pk = node.id
             session.commit()
-            session.refresh(node)
-            return node.id
+            return node_id_pk
 
     def update_node_run_completed(self, node_run_id: int, status: str, finished_at: datetime, result: Dict[str, Any]):
         """Actualiza un noderun cuando termina la ejecución"""
-        result_json = json_module.dumps(result, ensure_ascii=False)
+        result_json = _encode_json(result)
 
         with Session(self.engine) as session:
             node = session.get(NodeRun, node_run_id)
@@ -142,10 +152,9 @@ class WorkflowRepository:
                 run.status = status
                 run.finished_at = finished_at
                 run.duration = (finished_at - run.started_at).total_seconds()
-                run.result_summary = json_module.dumps(
+                run.result_summary = _encode_json(
                     {k: (v.get("status", "OK") if isinstance(v, dict) else str(v))
-     for k, v in results.items()}, 
-                    ensure_ascii=False
+                     for k, v in results.items()}
                 )
                 session.add(run)
                 session.commit()